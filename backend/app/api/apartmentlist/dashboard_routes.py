@@ -0,0 +1,55 @@
+"""
+Dashboard API routes module.
+Handles the landing-page endpoint returning every Apartment List summary in one response.
+"""
+
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Any, Optional
+from ...core.formats import render, response_format
+from ...processors.apartmentlist.dashboard_processor import DashboardProcessor
+from .rent_rev_routes import processor as rent_rev_processor
+from .vacancy_rev_routes import processor as vacancy_rev_processor
+from .time_on_market_routes import processor as time_on_market_processor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Create router instance with tags for better API documentation
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["dashboard"]
+)
+
+# Initialize processor on the metric routes' processors so their caches are shared
+processor = DashboardProcessor({
+    "rent": rent_rev_processor,
+    "vacancy": vacancy_rev_processor,
+    "time_on_market": time_on_market_processor
+})
+
+@router.get("")
+async def get_dashboard(
+    top_n: Optional[int] = Query(None, ge=1, le=100, description="Locations in each of the top and bottom groups"),
+    output_format: str = Depends(response_format)
+) -> Dict[str, Any]:
+    """
+    Get the State, Metro and City summaries of rent, vacancy and time on market.
+
+    Args:
+        top_n: Locations in each group (defaults to 3 for State, else 10)
+        output_format: Response encoding (json, columnar, msgpack, arrow)
+
+    Returns:
+        Dictionary containing every summary keyed by metric and location type
+    """
+    logger.info("Getting dashboard summaries")
+    try:
+        result = await processor.get_dashboard(top_n=top_n)
+        if "error" in result:
+            logger.error(f"Error getting dashboard data: {result['error']}")
+            raise HTTPException(status_code=404, detail=result["error"])
+        return render(result, output_format)
+    except Exception as e:
+        logger.error(f"Error processing dashboard data: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
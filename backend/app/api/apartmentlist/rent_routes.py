@@ -21,7 +21,7 @@ processor = RentProcessor()
 async def get_summary() -> Dict[str, Any]:
     """Get summary data for all location types."""
     try:
-        return processor.get_summary_data()
+        return await processor.get_summary_data()
     except Exception as e:
         logger.error(f"Error getting summary data: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get summary data")
@@ -30,7 +30,7 @@ async def get_summary() -> Dict[str, Any]:
 async def get_location_details(location_type: str, location_name: str) -> Dict[str, Any]:
     """Get detailed data for a specific location."""
     try:
-        return processor.get_location_details(location_type, location_name)
+        return await processor.get_location_details(location_type, location_name)
     except Exception as e:
         logger.error(f"Error getting location details: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get location details")
@@ -48,7 +48,7 @@ async def get_location_types() -> List[str]:
 async def get_locations_by_type(location_type: str) -> List[Dict[str, str]]:
     """Get list of available locations for a specific type."""
     try:
-        return processor.get_locations_by_type(location_type)
+        return await processor.get_locations_by_type(location_type)
     except Exception as e:
         logger.error(f"Error getting locations: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get locations") 
\ No newline at end of file
@@ -4,8 +4,10 @@ Handles API endpoints for apartment time on market data.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Any, List, Optional
+from ...core.formats import render, response_format
+from ...database.months import parse_month
 from ...processors.apartmentlist.time_on_market_processor import TimeOnMarketProcessor
 
 # Configure logging
@@ -21,50 +23,103 @@ router = APIRouter(
 processor = TimeOnMarketProcessor()
 
 @router.get("/location-types")
-async def get_location_types() -> Dict[str, Any]:
+async def get_location_types(
+    output_format: str = Depends(response_format)
+) -> Dict[str, Any]:
     """
     Get all available location types.
     
+    Args:
+        output_format: Response encoding (json, columnar, msgpack, arrow)
+        
     Returns:
         Dictionary containing list of location types
     """
     logger.info("Getting all location types")
     try:
-        result = processor.get_location_types()
+        result = await processor.get_location_types()
         if "error" in result:
             logger.error(f"Error getting location types: {result['error']}")
             raise HTTPException(status_code=404, detail=result["error"])
-        return result
+        return render(result, output_format)
     except Exception as e:
         logger.error(f"Error processing location types: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/summary/{location_type}")
-async def get_time_on_market_summary(location_type: str) -> Dict[str, Any]:
+async def get_time_on_market_summary(
+    location_type: str,
+    top_n: Optional[int] = Query(None, ge=1, le=100, description="Locations in each of the top and bottom groups"),
+    offset: int = Query(0, ge=0, description="Ranked locations to skip in each group"),
+    window: int = Query(3, ge=1, le=60, description="Trailing months averaged into yoy_change"),
+    lag: int = Query(12, ge=1, le=24, description="Months between compared values (12 = YoY, 1 = MoM)"),
+    output_format: str = Depends(response_format)
+) -> Dict[str, Any]:
     """
     Get time on market summary data for locations of specified type.
     
     Args:
         location_type: Type of location (State, Metro, City)
+        top_n: Locations in each group (defaults to 3 for State, else 10)
+        offset: Ranked locations to skip in each group
+        window: Trailing months averaged into yoy_change (3, 6, 12, ...)
+        lag: Months between compared values (12 for YoY, 1 for MoM)
+        output_format: Response encoding (json, columnar, msgpack, arrow)
         
     Returns:
         Dictionary containing summary data and metadata
     """
     logger.info(f"Getting time on market summary for location type: {location_type}")
     try:
-        result = processor.get_summary_data(location_type)
+        result = await processor.get_summary_data(location_type, top_n, offset, window, lag)
         if "error" in result:
             logger.error(f"Error getting summary data: {result['error']}")
             raise HTTPException(status_code=404, detail=result["error"])
-        return result
+        return render(result, output_format)
     except Exception as e:
         logger.error(f"Error processing summary data: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/rank/{location_type}/{location_name}")
+async def get_time_on_market_rank(
+    location_type: str,
+    location_name: str,
+    window: int = Query(3, ge=1, le=60, description="Trailing months averaged into yoy_change"),
+    lag: int = Query(12, ge=1, le=24, description="Months between compared values (12 = YoY, 1 = MoM)"),
+    output_format: str = Depends(response_format)
+) -> Dict[str, Any]:
+    """
+    Get the trailing YoY rank of a location among all locations of its type.
+    
+    Args:
+        location_type: Type of location
+        location_name: Name of location
+        window: Trailing months averaged into yoy_change
+        lag: Months between compared values (12 for YoY, 1 for MoM)
+        output_format: Response encoding (json, columnar, msgpack, arrow)
+        
+    Returns:
+        Dictionary containing rank, total, percentile and summary row
+    """
+    logger.info(f"Getting time on market rank for {location_type}: {location_name}")
+    try:
+        result = await processor.get_location_rank(location_type, location_name, window, lag)
+        if "error" in result:
+            logger.error(f"Error getting location rank: {result['error']}")
+            raise HTTPException(status_code=404, detail=result["error"])
+        return render(result, output_format)
+    except Exception as e:
+        logger.error(f"Error processing location rank: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/details/{location_type}/{location_name}")
 async def get_time_on_market_details(
     location_type: str,
-    location_name: str
+    location_name: str,
+    start: Optional[str] = Query(None, description="First month to include (YYYY_MM)"),
+    end: Optional[str] = Query(None, description="Last month to include (YYYY_MM)"),
+    max_points: Optional[int] = Query(None, ge=3, le=1000, description="Downsample to at most this many months (LTTB)"),
+    output_format: str = Depends(response_format)
 ) -> Dict[str, Any]:
     """
     Get detailed time on market data for a specific location.
@@ -72,39 +127,92 @@ async def get_time_on_market_details(
     Args:
         location_type: Type of location
         location_name: Name of location
+        start: First month to include (YYYY_MM)
+        end: Last month to include (YYYY_MM)
+        max_points: Maximum number of months, downsampled with LTTB
+        output_format: Response encoding (json, columnar, msgpack, arrow)
         
     Returns:
         Dictionary containing location details and time series data
     """
+    try:
+        start_code = parse_month(start) if start else None
+        end_code = parse_month(end) if end else None
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if start_code is not None and end_code is not None and start_code > end_code:
+        raise HTTPException(status_code=422, detail="start must not be after end")
     logger.info(f"Getting time on market details for {location_type}: {location_name}")
     try:
-        result = processor.get_location_details(location_type, location_name)
+        result = await processor.get_location_details(
+            location_type,
+            location_name,
+            start_code,
+            end_code,
+            max_points
+        )
         if "error" in result:
             logger.error(f"Error getting location details: {result['error']}")
             raise HTTPException(status_code=404, detail=result["error"])
-        return result
+        return render(result, output_format)
     except Exception as e:
         logger.error(f"Error processing location details: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/details/{location_type}/{location_name}/rolling")
+async def get_time_on_market_rolling_stats(
+    location_type: str,
+    location_name: str,
+    windows: List[int] = Query([3, 6, 12], description="Rolling window lengths in months (2-60)"),
+    output_format: str = Depends(response_format)
+) -> Dict[str, Any]:
+    """
+    Get rolling mean, rolling std and drawdown for a specific location.
+    
+    Args:
+        location_type: Type of location
+        location_name: Name of location
+        windows: Rolling window lengths in months
+        output_format: Response encoding (json, columnar, msgpack, arrow)
+        
+    Returns:
+        Dictionary containing rolling statistics
+    """
+    if not windows or any(window < 2 or window > 60 for window in windows):
+        raise HTTPException(status_code=422, detail="windows must be between 2 and 60 months")
+    logger.info(f"Getting time on market rolling statistics for {location_type}: {location_name}")
+    try:
+        result = await processor.get_location_rolling_stats(location_type, location_name, windows)
+        if "error" in result:
+            logger.error(f"Error getting rolling statistics: {result['error']}")
+            raise HTTPException(status_code=404, detail=result["error"])
+        return render(result, output_format)
+    except Exception as e:
+        logger.error(f"Error processing rolling statistics: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/locations/{location_type}")
-async def get_locations(location_type: str) -> Dict[str, Any]:
+async def get_locations(
+    location_type: str,
+    output_format: str = Depends(response_format)
+) -> Dict[str, Any]:
     """
     Get available locations of specified type.
     
     Args:
         location_type: Type of location
+        output_format: Response encoding (json, columnar, msgpack, arrow)
         
     Returns:
         Dictionary containing list of locations
     """
     logger.info(f"Getting locations for type: {location_type}")
     try:
-        result = processor.get_locations_by_type(location_type)
+        result = await processor.get_locations_by_type(location_type)
         if "error" in result:
             logger.error(f"Error getting locations: {result['error']}")
             raise HTTPException(status_code=404, detail=result["error"])
-        return result
+        return render(result, output_format)
     except Exception as e:
         logger.error(f"Error processing locations: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -4,7 +4,6 @@ Handles endpoints for rent estimates functionality.
 """
 
 import logging
-import httpx
 import json
 import os
 import hashlib
@@ -27,9 +26,6 @@ router = APIRouter(
 client = RentEstimatesClient()
 cache_manager = RentEstimatesCacheManager()
 
-# 修正 API URL 格式
-RENTCAST_API_URL = "https://api.rentcast.io/v1/avm/rent/long-term"
-
 # Mock data configuration
 MOCK_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 
                             "mock_data", "rentcast", "rent_estimates")
@@ -85,6 +81,26 @@ def get_mock_data(params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         logger.error(f"Error reading mock data: {str(e)}")
     return None
 
+async def fetch_rent_comps(params: Dict[str, Any]) -> Dict[str, Any]:
+    """从 RentCast API（开发模式下优先使用 mock 数据）获取租金对比数据"""
+    # 如果是开发模式，尝试使用 mock 数据
+    if USE_MOCK_DATA:
+        mock_data = get_mock_data(params)
+        if mock_data:
+            return mock_data
+    
+    logger.info(f"Sending request to RentCast API with params: {params}")
+        
+    # 通过共享连接池的 RentEstimatesClient 请求 RentCast API
+    response_data = await client.get_rent_comps(params)
+    logger.info("Successfully received response from RentCast API")
+    
+    # 如果是开发模式，保存响应数据作为 mock 数据
+    if USE_MOCK_DATA:
+        save_mock_data(params, response_data)
+    
+    return response_data
+
 @router.get("/long-term")
 async def get_rent_comps(
     address: str = Query(..., description="Property address"),
@@ -116,56 +132,12 @@ async def get_rent_comps(
         
         logger.info(f"Request parameters: {params}")
         
-        # 首先检查缓存
-        cached_data = await cache_manager.get(params)
-        if cached_data:
-            logger.info("Returning cached data")
-            return cached_data
-
-        # 如果是开发模式，尝试使用 mock 数据
-        if USE_MOCK_DATA:
-            mock_data = get_mock_data(params)
-            if mock_data:
-                return mock_data
+        # 缓存新鲜时直接返回；过期但未超过硬过期时间时返回旧数据并在后台刷新
+        response_data = await cache_manager.get_or_fetch(params, fetch_rent_comps)
         
-        logger.info(f"Sending request to RentCast API with params: {params}")
-            
-        # 准备请求头
-        headers = {
-            "accept": "application/json",
-            "X-Api-Key": settings.RENTCAST_API_KEY
-        }
-            
-        # 发送请求到 RentCast API
-        async with httpx.AsyncClient() as client:
-            logger.info(f"Making request to: {RENTCAST_API_URL}")
-            response = await client.get(
-                RENTCAST_API_URL,
-                params=params,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            # 检查响应状态
-            response.raise_for_status()
-            logger.info("Successfully received response from RentCast API")
-            
-            # 获取响应数据
-            response_data = response.json()
-            
-            # 保存到缓存
-            await cache_manager.set(params, response_data)
-            
-            # 如果是开发模式，保存响应数据作为 mock 数据
-            if USE_MOCK_DATA:
-                save_mock_data(params, response_data)
-            
-            logger.info("Successfully retrieved rent comps data")
-            return response_data
+        logger.info("Successfully retrieved rent comps data")
+        return response_data
             
-    except httpx.HTTPError as e:
-        logger.error(f"HTTP error occurred: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch data from RentCast API: {str(e)}")
     except Exception as e:
         logger.error(f"Error getting rent comps: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
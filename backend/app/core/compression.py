@@ -0,0 +1,188 @@
+"""
+Response compression module.
+gzip (and brotli when installed) compression of response bodies above a size threshold.
+"""
+
+import os
+import gzip
+import logging
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into coding -> q-value.
+
+    Args:
+        header: Accept-Encoding header value
+
+    Returns:
+        Dictionary of lower-cased codings and their q-values
+    """
+    codings: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding.strip().lower()] = quality
+    return codings
+
+
+def add_vary_accept_encoding(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """
+    Add ``Vary: Accept-Encoding`` to response headers unless already listed.
+
+    Args:
+        headers: ASGI response headers
+
+    Returns:
+        Headers listing Accept-Encoding (or ``*``) in Vary
+    """
+    for name, value in headers:
+        if name.lower() == b"vary":
+            fields = {field.strip().lower() for field in value.split(b",")}
+            if b"accept-encoding" in fields or b"*" in fields:
+                return headers
+    return headers + [(b"vary", b"Accept-Encoding")]
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-body responses.
+
+    Brotli is preferred when the ``brotli`` package is installed and the
+    client accepts it, gzip otherwise. Bodies below ``minimum_size``,
+    already-encoded and streamed responses pass through uncompressed. A strong
+    ETag on a compressed response is weakened, since the bytes no longer
+    match the identity representation it was computed for. Every response
+    that was not already encoded gets ``Vary: Accept-Encoding``, whether or
+    not it ended up compressed, so shared caches key on the client's codings.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: Optional[int] = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 5
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Smallest body in bytes worth compressing (defaults to COMPRESSION_MIN_SIZE)
+            gzip_level: gzip compression level
+            brotli_quality: Brotli quality (0-11)
+        """
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else int(
+            os.getenv("COMPRESSION_MIN_SIZE", "1024")
+        )
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Pick the best supported coding accepted by the client."""
+        codings = parse_accept_encoding(accept_encoding)
+        wildcard = codings.get("*", 0.0)
+        if brotli is not None and codings.get("br", wildcard) > 0:
+            return "br"
+        if codings.get("gzip", wildcard) > 0:
+            return "gzip"
+        return None
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a body with the given coding."""
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = self._choose_encoding(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            async def send_with_vary(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    if not any(name == b"content-encoding" for name, _ in headers):
+                        message = {**message, "headers": add_vary_accept_encoding(headers)}
+                await send(message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+
+        start_message: Optional[dict] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Hold the start message until the body size is known
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            headers: List[Tuple[bytes, bytes]] = list(start_message.get("headers", []))
+            body = message.get("body", b"")
+            encoded = any(name == b"content-encoding" for name, _ in headers)
+            skip = (
+                encoded
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+            )
+            if skip:
+                passthrough = True
+                if not encoded:
+                    start_message = {**start_message, "headers": add_vary_accept_encoding(headers)}
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = self._compress(body, encoding)
+            rewritten = []
+            for name, value in headers:
+                if name == b"content-length":
+                    continue
+                if name == b"etag" and not value.startswith(b"W/"):
+                    value = b"W/" + value
+                rewritten.append((name, value))
+            rewritten = add_vary_accept_encoding(rewritten + [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode())
+            ])
+            await send({**start_message, "headers": rewritten})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,339 @@
+"""
+Response formats module.
+Columnar JSON, MessagePack and Arrow IPC encodings of the analytics responses.
+
+Columnar encoding turns the ``data`` part of a response into tables:
+
+- A time-series dictionary (one carrying ``dates``) becomes
+  ``{"dates": {"start", "deltas"}, "columns", "types", "attributes"}``.
+  Dates are the first month plus the month gaps between consecutive dates,
+  run-length encoded as ``[gap, count]`` pairs (a dense monthly series is a
+  single pair). Every list aligned with ``dates`` is a column keyed by its
+  dotted path (``rent_estimate.values``); other leaves, nested time series
+  such as ``forecast`` included, are kept under ``attributes``.
+- A list of row dictionaries becomes ``{"length", "columns", "types"}``.
+
+MessagePack carries the same structure with float64 columns packed as
+little-endian float64 binaries (NaN for missing). Arrow IPC streams carry a
+single table: time series are outer-joined on date, row lists are stacked
+(with a ``section`` column when there are several), and response metadata
+and attributes travel as JSON in the schema metadata.
+"""
+
+import logging
+from typing import List, Dict, Any, Tuple
+import numpy as np
+from fastapi import HTTPException, Query
+from fastapi.responses import Response
+from ..database.months import month_codes, month_labels
+from .responses import ORJSONResponse, dumps
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional
+    pa = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+RESPONSE_FORMATS = ("json", "columnar", "msgpack", "arrow")
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def response_format(
+    format: str = Query(
+        "json",
+        pattern="^(json|columnar|msgpack|arrow)$",
+        description="Response encoding: json, columnar (JSON), msgpack or arrow (IPC stream)"
+    )
+) -> str:
+    """
+    Validate the ``format`` query parameter (FastAPI dependency).
+
+    Raises:
+        HTTPException: 406 if the format's optional package is not installed
+    """
+    if format == "msgpack" and msgpack is None:
+        raise HTTPException(status_code=406, detail="msgpack format requires the msgpack package")
+    if format == "arrow" and pa is None:
+        raise HTTPException(status_code=406, detail="arrow format requires the pyarrow package")
+    return format
+
+
+def encode_dates(dates: List[str]) -> Dict[str, Any]:
+    """
+    Delta-encode YYYY_MM dates.
+
+    Args:
+        dates: Ascending YYYY_MM months
+
+    Returns:
+        Dictionary with the first month and run-length encoded ``[gap, count]``
+        pairs of the month gaps between consecutive dates
+    """
+    if not dates:
+        return {"start": None, "deltas": []}
+    gaps = np.diff(month_codes(dates))
+    if gaps.size == 0:
+        return {"start": dates[0], "deltas": []}
+    run_starts = np.flatnonzero(np.concatenate([[True], gaps[1:] != gaps[:-1]]))
+    run_lengths = np.diff(np.concatenate([run_starts, [gaps.size]]))
+    return {
+        "start": dates[0],
+        "deltas": [[int(gaps[i]), int(n)] for i, n in zip(run_starts, run_lengths)]
+    }
+
+
+def decode_dates(encoded: Dict[str, Any]) -> List[str]:
+    """Decode delta-encoded dates back to YYYY_MM months."""
+    if encoded["start"] is None:
+        return []
+    gaps = np.repeat(
+        [gap for gap, _ in encoded["deltas"]],
+        [count for _, count in encoded["deltas"]]
+    ).astype(np.int64)
+    codes = month_codes([encoded["start"]])[0] + np.concatenate([[0], np.cumsum(gaps)])
+    return month_labels(codes)
+
+
+def column_type(values: List[Any]) -> str:
+    """Infer the type name of a column from its non-null values."""
+    present = [value for value in values if value is not None]
+    if not present:
+        return "float64"
+    if all(isinstance(value, bool) for value in present):
+        return "bool"
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return "int64"
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return "float64"
+    if all(isinstance(value, str) for value in present):
+        return "string"
+    return "object"
+
+
+def _is_rows(value: Any) -> bool:
+    """Check whether a value is a non-empty list of row dictionaries."""
+    return isinstance(value, list) and bool(value) and all(isinstance(row, dict) for row in value)
+
+
+def columnar_series(series: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode a time-series dictionary as a columnar table.
+
+    Args:
+        series: Dictionary with ``dates`` and nested value lists
+
+    Returns:
+        Columnar table (see module docstring)
+    """
+    dates = series["dates"]
+    columns: Dict[str, List[Any]] = {}
+    attributes: Dict[str, Any] = {}
+
+    def walk(node: Dict[str, Any], prefix: str) -> None:
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            if isinstance(value, dict) and "dates" in value:
+                attributes[path] = columnar_series(value)
+            elif isinstance(value, dict) and value:
+                walk(value, f"{path}.")
+            elif isinstance(value, list) and len(value) == len(dates):
+                columns[path] = value
+            else:
+                attributes[path] = to_columnar(value)
+
+    walk({key: value for key, value in series.items() if key != "dates"}, "")
+    return {
+        "dates": encode_dates(dates),
+        "columns": columns,
+        "types": {path: column_type(values) for path, values in columns.items()},
+        "attributes": attributes
+    }
+
+
+def columnar_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Encode a list of row dictionaries as a columnar table.
+
+    Args:
+        rows: Row dictionaries (keys may differ; missing values become null)
+
+    Returns:
+        Columnar table (see module docstring)
+    """
+    names: Dict[str, None] = {}
+    for row in rows:
+        names.update(dict.fromkeys(row))
+    columns = {name: [row.get(name) for row in rows] for name in names}
+    return {
+        "length": len(rows),
+        "columns": columns,
+        "types": {name: column_type(values) for name, values in columns.items()}
+    }
+
+
+def to_columnar(data: Any) -> Any:
+    """
+    Recursively encode response data in columnar form.
+
+    Args:
+        data: ``data`` part of a response
+
+    Returns:
+        Columnar data (see module docstring)
+    """
+    if isinstance(data, dict):
+        if isinstance(data.get("dates"), list):
+            return columnar_series(data)
+        return {key: to_columnar(value) for key, value in data.items()}
+    if _is_rows(data):
+        return columnar_rows(data)
+    return data
+
+
+def _pack_floats(node: Any) -> Any:
+    """Replace float64 columns of a columnar structure with little-endian float64 binaries."""
+    if isinstance(node, dict):
+        if "columns" in node and "types" in node:
+            packed = dict(node)
+            packed["columns"] = {
+                path: np.array(values, dtype="<f8").tobytes() if node["types"][path] == "float64" else values
+                for path, values in node["columns"].items()
+            }
+            if "attributes" in node:
+                packed["attributes"] = _pack_floats(node["attributes"])
+            return packed
+        return {key: _pack_floats(value) for key, value in node.items()}
+    return node
+
+
+def _collect_tables(
+    node: Any,
+    path: str,
+    series: List[Tuple[str, Dict[str, Any]]],
+    rows: List[Tuple[str, Dict[str, Any]]],
+    attributes: Dict[str, Any]
+) -> None:
+    """Gather the time-series and row tables of a columnar structure, with their paths."""
+    if isinstance(node, dict) and "dates" in node and "columns" in node:
+        series.append((path, node))
+        for key, value in node["attributes"].items():
+            _collect_tables(value, f"{path}{key}.", series, rows, attributes)
+    elif isinstance(node, dict) and "length" in node and "columns" in node:
+        rows.append((path, node))
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            _collect_tables(value, f"{path}{key}.", series, rows, attributes)
+    elif path:
+        attributes[path[:-1]] = node
+
+
+def _arrow_array(values: List[Any], type_name: str) -> "pa.Array":
+    """Build an Arrow array for a column of the given type name."""
+    if type_name == "float64":
+        return pa.array(values, type=pa.float64())
+    if type_name == "int64":
+        return pa.array(values, type=pa.int64())
+    if type_name == "bool":
+        return pa.array(values, type=pa.bool_())
+    if type_name == "string":
+        return pa.array(values, type=pa.string())
+    return pa.array([None if value is None else dumps(value).decode() for value in values], type=pa.string())
+
+
+def to_arrow(result: Dict[str, Any]) -> bytes:
+    """
+    Encode a response as a single-table Arrow IPC stream.
+
+    Args:
+        result: Response with ``metadata`` and ``data``
+
+    Returns:
+        Arrow IPC stream bytes
+    """
+    data = result.get("data")
+    if isinstance(data, list) and not _is_rows(data):
+        data = [{"value": value} for value in data]
+    series: List[Tuple[str, Dict[str, Any]]] = []
+    rows: List[Tuple[str, Dict[str, Any]]] = []
+    attributes: Dict[str, Any] = {}
+    _collect_tables(to_columnar(data), "", series, rows, attributes)
+
+    arrays: Dict[str, Any] = {}
+    if series:
+        # Outer join every time series on the month axis
+        codes_by_table = [month_codes(decode_dates(table["dates"])) for _, table in series]
+        all_codes = np.unique(np.concatenate(codes_by_table))
+        arrays["date"] = pa.array(month_labels(all_codes), type=pa.string())
+        for (path, table), codes in zip(series, codes_by_table):
+            positions = np.searchsorted(all_codes, codes)
+            for name, values in table["columns"].items():
+                aligned: List[Any] = [None] * len(all_codes)
+                for position, value in zip(positions, values):
+                    aligned[position] = value
+                arrays[f"{path}{name}"] = _arrow_array(aligned, table["types"][name])
+    elif rows:
+        # Stack row tables, tagging each row with the section it came from
+        names: Dict[str, str] = {}
+        for _, table in rows:
+            for name, type_name in table["types"].items():
+                names.setdefault(name, type_name)
+        if len(rows) > 1:
+            arrays["section"] = pa.array(
+                [path[:-1] for path, table in rows for _ in range(table["length"])],
+                type=pa.string()
+            )
+        for name, type_name in names.items():
+            values = [
+                value
+                for _, table in rows
+                for value in table["columns"].get(name, [None] * table["length"])
+            ]
+            arrays[name] = _arrow_array(values, type_name)
+    else:
+        # Scalar responses become a single row
+        for name, value in attributes.items():
+            arrays[name] = _arrow_array([value], column_type([value]))
+        attributes = {}
+
+    table = pa.table(arrays).replace_schema_metadata({
+        "metadata": dumps(result.get("metadata", {})),
+        "attributes": dumps(attributes)
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def render(result: Dict[str, Any], format: str = "json") -> Response:
+    """
+    Render a response in the requested format.
+
+    Args:
+        result: Response with ``metadata`` and ``data``
+        format: One of RESPONSE_FORMATS
+
+    Returns:
+        Response carrying the encoded body
+    """
+    if format == "json":
+        return ORJSONResponse(result)
+
+    columnar = {
+        "metadata": {**result.get("metadata", {}), "format": format},
+        "data": to_columnar(result.get("data"))
+    }
+    if format == "columnar":
+        return ORJSONResponse(columnar)
+    if format == "msgpack":
+        columnar["data"] = _pack_floats(columnar["data"])
+        return Response(msgpack.packb(columnar, use_bin_type=True), media_type=MSGPACK_MEDIA_TYPE)
+    return Response(to_arrow(result), media_type=ARROW_MEDIA_TYPE)
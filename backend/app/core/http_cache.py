@@ -0,0 +1,202 @@
+"""
+HTTP caching module.
+Conditional GET support (ETag / Last-Modified) keyed on the data version of each view.
+"""
+
+import os
+import hashlib
+import logging
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl, urlencode
+from ..database.data_version import data_version_monitor
+from ..database.snapshot import snapshot_store
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ConditionalResponseMiddleware:
+    """
+    ASGI middleware answering conditional GETs from the data version alone.
+
+    Every successful GET under a watched path prefix gets a weak ETag
+    derived from the data version of its view(s), the path and the query string, a
+    ``Last-Modified`` of the time that version was first seen, and CDN
+    friendly ``Cache-Control``. A matching ``If-None-Match`` (or, without
+    one, a current ``If-Modified-Since``) is answered with 304 before the
+    request reaches the routes, so processors are never touched.
+
+    The ETag identifies the data, not the bytes: it is weak and shared by
+    the identity and compressed encodings, and 304s carry the same
+    validators and ``Vary: Accept-Encoding`` as the 200 they revalidate.
+    ``If-None-Match: *`` only matches once the route has found the resource.
+    """
+
+    def __init__(
+        self,
+        app,
+        views: Dict[str, Union[str, Sequence[str]]],
+        max_age: Optional[int] = None,
+        s_maxage: Optional[int] = None
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            views: Mapping of URL path prefix to the view (or views) whose version keys it
+            max_age: Browser cache lifetime in seconds (defaults to HTTP_CACHE_MAX_AGE)
+            s_maxage: Shared (CDN) cache lifetime in seconds (defaults to HTTP_CACHE_S_MAXAGE)
+        """
+        self.app = app
+        # Longest prefix first so nested prefixes resolve to the most specific view
+        self.views = sorted(
+            ((prefix, (tables,) if isinstance(tables, str) else tuple(tables)) for prefix, tables in views.items()),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        max_age = max_age if max_age is not None else int(os.getenv("HTTP_CACHE_MAX_AGE", "300"))
+        s_maxage = s_maxage if s_maxage is not None else int(os.getenv("HTTP_CACHE_S_MAXAGE", "900"))
+        self.cache_control = f"public, max-age={max_age}, s-maxage={s_maxage}".encode()
+
+    def _tables_for(self, path: str) -> Optional[Tuple[str, ...]]:
+        """Get the views backing a request path, if any."""
+        for prefix, table_names in self.views:
+            if path == prefix or path.startswith(prefix + "/"):
+                return table_names
+        return None
+
+    @staticmethod
+    def _version(table_names: Tuple[str, ...]) -> Optional[str]:
+        """Get the combined data version of views, or None while any is unknown."""
+        versions = []
+        for table_name in table_names:
+            # Prefer the version of the snapshot being served over one still reloading
+            version = snapshot_store.peek_version(table_name) or data_version_monitor.peek_version(table_name)
+            if version is None:
+                return None
+            if snapshot_store.forecasts_pending(table_name):
+                # Responses built before the forecasts are fitted are a different representation
+                version += "+forecasting"
+            versions.append(version)
+        return "|".join(versions)
+
+    @staticmethod
+    def _changed_at(table_names: Tuple[str, ...]) -> Optional[float]:
+        """Get the time the newest of the views' served versions took effect."""
+        times = [
+            snapshot_store.peek_published_at(table_name) or data_version_monitor.peek_changed_at(table_name)
+            for table_name in table_names
+        ]
+        if any(changed_at is None for changed_at in times):
+            return None
+        return max(times)
+
+    @staticmethod
+    def _etag(version: str, path: str, query_string: bytes) -> str:
+        """
+        Compute the weak ETag of a request under a data version.
+
+        Query parameters are ordered by name (keeping the order of repeated
+        names) so equivalent URLs share one ETag.
+        """
+        query = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+        canonical = urlencode(sorted(query, key=lambda item: item[0]))
+        digest = hashlib.sha256(f"{version}\n{path}\n{canonical}".encode()).hexdigest()
+        return f'W/"{digest[:32]}"'
+
+    @staticmethod
+    def _etag_matches(etag: str, if_none_match: str) -> bool:
+        """Weak comparison of an ETag against the tags listed in an If-None-Match header."""
+        opaque = etag[2:] if etag.startswith("W/") else etag
+        candidates = (tag.strip() for tag in if_none_match.split(","))
+        return opaque in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+    @staticmethod
+    def _not_modified_since(changed_at: float, if_modified_since: str) -> bool:
+        """Check an If-Modified-Since header against the version timestamp."""
+        try:
+            return int(changed_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    def _cache_headers(self, etag: str, changed_at: Optional[float]) -> List[Tuple[bytes, bytes]]:
+        """Build the validator and Cache-Control headers of a response."""
+        headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", self.cache_control),
+            (b"vary", b"Accept-Encoding")
+        ]
+        if changed_at is not None:
+            headers.append((b"last-modified", formatdate(changed_at, usegmt=True).encode()))
+        return headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        table_names = self._tables_for(scope["path"])
+        if table_names is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = {
+            name: value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name in (b"if-none-match", b"if-modified-since")
+        }
+        # "*" matches any existing representation, which only the route can tell
+        match_any = request_headers.get(b"if-none-match", "").strip() == "*"
+
+        version = self._version(table_names)
+        if version is not None and not match_any:
+            etag = self._etag(version, scope["path"], scope["query_string"])
+            changed_at = self._changed_at(table_names)
+            if b"if-none-match" in request_headers:
+                not_modified = self._etag_matches(etag, request_headers[b"if-none-match"])
+            elif b"if-modified-since" in request_headers and changed_at is not None:
+                not_modified = self._not_modified_since(changed_at, request_headers[b"if-modified-since"])
+            else:
+                not_modified = False
+            if not_modified:
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": self._cache_headers(etag, changed_at)
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        replaced = False
+
+        async def send_with_validators(message):
+            nonlocal replaced
+            if replaced:
+                # Drop the body of a 200 answered as 304
+                return
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                # The version may only become known (cold start) or change while the request ran
+                current = self._version(table_names)
+                if current is not None and (version is None or current == version):
+                    cache_headers = self._cache_headers(
+                        self._etag(current, scope["path"], scope["query_string"]),
+                        self._changed_at(table_names)
+                    )
+                    if match_any:
+                        replaced = True
+                        await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+                        await send({"type": "http.response.body", "body": b""})
+                        return
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + cache_headers
+                elif match_any:
+                    # No validators to send, but the resource exists
+                    replaced = True
+                    await send({"type": "http.response.start", "status": 304, "headers": []})
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
@@ -0,0 +1,45 @@
+"""
+Response classes module.
+orjson-based JSON responses for the analytics endpoints.
+"""
+
+from typing import Any
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# NaN and infinities serialize as null; numpy scalars and arrays serialize natively
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Fall back to FastAPI's encoder for types orjson does not know."""
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes.
+
+    Args:
+        content: JSON-compatible content (NaN/inf become null)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Route handlers returning this directly also skip FastAPI's
+    ``jsonable_encoder`` pass, which dominates the cost of large float lists.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """Render content with orjson."""
+        return dumps(content)
@@ -0,0 +1,119 @@
+"""
+Single-flight module.
+Coalesces identical concurrent calls into one in-flight computation.
+"""
+
+import asyncio
+import logging
+import functools
+from typing import Dict, Any, Callable, Awaitable, Hashable, TypeVar
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn lists, sets and dicts of call arguments into hashable equivalents."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class SingleFlight:
+    """
+    Registry of in-flight computations keyed by call identity.
+
+    The first caller of a key starts the computation as a task; callers
+    arriving while it runs await the same task and receive its result (or
+    exception). The task is shielded, so a cancelled caller (e.g. a client
+    disconnect) does not cancel the computation for the others.
+    """
+
+    def __init__(self):
+        """Initialize empty registry and counters."""
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, operation: str, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``func`` once for all concurrent callers of the same key.
+
+        Args:
+            operation: Operation name reported in the metrics
+            key: Call identity (operation and arguments)
+            func: Coroutine function computing the result
+
+        Returns:
+            Result of the shared computation
+        """
+        stats = self._stats.setdefault(operation, {"calls": 0, "executions": 0})
+        stats["calls"] += 1
+
+        task = self._in_flight.get(key)
+        if task is None:
+            stats["executions"] += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._finish, key))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished computation."""
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing metrics.
+
+        Returns:
+            Dictionary with total and per-operation calls, executions,
+            coalesced calls and coalescing ratio (share of calls served by
+            another caller's computation)
+        """
+        def summarize(calls: int, executions: int) -> Dict[str, Any]:
+            coalesced = calls - executions
+            return {
+                "calls": calls,
+                "executions": executions,
+                "coalesced": coalesced,
+                "coalescing_ratio": coalesced / calls if calls else 0.0
+            }
+
+        total_calls = sum(stats["calls"] for stats in self._stats.values())
+        total_executions = sum(stats["executions"] for stats in self._stats.values())
+        return {
+            **summarize(total_calls, total_executions),
+            "in_flight": len(self._in_flight),
+            "operations": {
+                operation: summarize(stats["calls"], stats["executions"])
+                for operation, stats in sorted(self._stats.items())
+            }
+        }
+
+
+# Process-wide single-flight registry
+single_flight = SingleFlight()
+
+
+def coalesced(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Decorate an async processor method so identical concurrent calls share one computation.
+
+    Calls are identical when they target the same instance with equal
+    arguments; the operation is reported as ``ClassName.method_name``.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        operation = f"{type(self).__name__}.{method.__name__}"
+        key = (operation, id(self), _freeze(args), _freeze(kwargs))
+        return await single_flight.do(operation, key, lambda: method(self, *args, **kwargs))
+    return wrapper
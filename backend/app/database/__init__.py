@@ -3,7 +3,49 @@ Database module.
 """
 
 from .base import BaseDBClient
+from .bulk_loader import BulkLoader, ColumnarBuffer
+from .data_version import DataVersionMonitor, VersionedCache, data_version_monitor
+from .forecast import ForecastResult, fit_forecasts, holt_winters, precompute_forecasts
+from .month_catalog import MonthCatalog, month_catalog
+from .months import month_code, month_codes, month_label, month_labels, parse_month, shift_month
+from .ranking import RankIndex
+from .registry import ClientRegistry, client_registry
+from .snapshot import SnapshotStore, ViewSnapshot, snapshot_store
+from .time_series import build_rolling_stats, build_time_series, drawdown, lttb_indices, rolling_mean_std, yoy_change
 from .apartmentlist.rent_db import RentDBClient
 from .apartmentlist.vacancy_db import VacancyDBClient
 
-__all__ = ["BaseDBClient", "RentDBClient", "VacancyDBClient"] 
\ No newline at end of file
+__all__ = [
+    "BaseDBClient",
+    "RentDBClient",
+    "VacancyDBClient",
+    "BulkLoader",
+    "ColumnarBuffer",
+    "DataVersionMonitor",
+    "VersionedCache",
+    "data_version_monitor",
+    "ForecastResult",
+    "fit_forecasts",
+    "holt_winters",
+    "precompute_forecasts",
+    "MonthCatalog",
+    "month_catalog",
+    "month_code",
+    "month_codes",
+    "month_label",
+    "month_labels",
+    "parse_month",
+    "shift_month",
+    "RankIndex",
+    "ClientRegistry",
+    "client_registry",
+    "SnapshotStore",
+    "ViewSnapshot",
+    "snapshot_store",
+    "build_rolling_stats",
+    "build_time_series",
+    "drawdown",
+    "lttb_indices",
+    "rolling_mean_std",
+    "yoy_change"
+] 
\ No newline at end of file
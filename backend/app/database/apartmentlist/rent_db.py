@@ -4,8 +4,11 @@ Handles data retrieval for apartment rent estimates.
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
 from ..base import BaseDBClient
+from ..month_catalog import month_catalog
+from ..months import MONTHS_PER_YEAR, month_code, month_codes, month_labels
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,24 +21,17 @@ class RentDBClient(BaseDBClient):
         super().__init__()
         self.table_name: str = "apartment_list_rent_estimates_view"
 
-    def get_latest_months(self, count: int = 3) -> List[str]:
-        """Get the latest months from the database in YYYY_MM format."""
-        response = self.client.table(self.table_name)\
-            .select("year_month")\
-            .order("year_month", desc=True)\
-            .limit(count)\
-            .execute()
-        
-        logger.info(f"Latest months response: {response.data}")
+    async def get_latest_months(self, count: int = 3) -> List[str]:
+        """Get the latest distinct months from the month catalog in YYYY_MM format."""
+        latest_months = await month_catalog.get_latest_months(self.client, self.table_name, count)
         
-        if not response.data:
+        if not latest_months:
             raise ValueError(f"No data found in table {self.table_name}")
         
-        latest_months = sorted([item["year_month"] for item in response.data], reverse=True)
         logger.info(f"Latest months: {latest_months}")
         return latest_months
 
-    def get_location_data(self, location_type: str) -> List[Dict[str, Any]]:
+    async def get_location_data(self, location_type: str) -> List[Dict[str, Any]]:
         """
         Get rent data for specific location type.
         
@@ -51,98 +47,85 @@ class RentDBClient(BaseDBClient):
 
         logger.info(f"Querying with normalized type: {normalized_type}")
         
-        # Get all available locations for this type
-        locations_response = self.client.table(self.table_name)\
-            .select("location_name")\
-            .eq("location_type", normalized_type)\
-            .execute()
-        
-        if not locations_response.data:
+        # Latest 3 months and the same months one year earlier, as month codes
+        latest_codes = await month_catalog.get_latest_month_codes(self.client, self.table_name, 3)
+        if not len(latest_codes):
+            raise ValueError(f"No data found in table {self.table_name}")
+        latest_months = month_labels(latest_codes)
+        year_ago_codes = latest_codes - MONTHS_PER_YEAR
+        
+        # One bulk query for the six relevant months of every location
+        rent_columns = ["rent_estimate_overall", "rent_estimate_1br", "rent_estimate_2br"]
+        buffer = await self.bulk_load(
+            ["location_name", "year_month", *rent_columns],
+            numeric_columns=rent_columns,
+            apply_filters=lambda query: query
+                .eq("location_type", normalized_type)
+                .in_("year_month", month_labels(np.concatenate([latest_codes, year_ago_codes]))),
+            order_by=["location_name", "year_month"]
+        )
+        
+        if not len(buffer):
             logger.error(f"No locations found for type: {normalized_type}")
             return []
         
-        # Get recent months data
-        latest_months = self.get_latest_months(3)
-        year_ago_months = [
-            f"{int(month.split('_')[0])-1}_{month.split('_')[1]}"
-            for month in latest_months
-        ]
+        # Pivot each rent column to a (location x month code) matrix
+        frame = buffer.to_frame()
+        frame["month"] = month_codes(buffer["year_month"])
+        grouped = frame.groupby(["location_name", "month"])
+        months = [*latest_codes, *year_ago_codes]
+        matrices = {
+            metric: grouped[f"rent_estimate_{metric}"].first().unstack().reindex(columns=months)
+            for metric in ["overall", "1br", "2br"]
+        }
+        location_names = matrices["overall"].index
+        current = {
+            metric: matrix[latest_codes].reindex(location_names).to_numpy(dtype=float)
+            for metric, matrix in matrices.items()
+        }
+        year_ago = {
+            metric: matrix[year_ago_codes].reindex(location_names).to_numpy(dtype=float)
+            for metric, matrix in matrices.items()
+        }
         
-        # Process data for each location
-        result = []
-        unique_locations = {item["location_name"] for item in locations_response.data}
+        # Calculate year-over-year changes of overall rent for all locations at once
+        valid = (current["overall"] > 0) & (year_ago["overall"] > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            yoy_changes = np.where(
+                valid,
+                (current["overall"] - year_ago["overall"]) / year_ago["overall"] * 100,
+                0.0
+            )
+        valid_counts = valid.sum(axis=1)
         
-        for location_name in unique_locations:
-            try:
-                # Get all data for this location
-                location_data = self.client.table(self.table_name)\
-                    .select("*")\
-                    .eq("location_type", normalized_type)\
-                    .eq("location_name", location_name)\
-                    .in_("year_month", [*latest_months, *year_ago_months])\
-                    .execute()
-                
-                if not location_data.data:
-                    continue
-                    
-                current_data = {}
-                year_ago_data = {}
-                
-                # Process data
-                for row in location_data.data:
-                    data_point = {
-                        "overall": row["rent_estimate_overall"],
-                        "1br": row["rent_estimate_1br"],
-                        "2br": row["rent_estimate_2br"]
+        def to_value(value: float) -> Optional[float]:
+            return None if np.isnan(value) else float(value)
+        
+        result = []
+        for i in np.flatnonzero(valid_counts > 0):
+            result.append({
+                "location_name": location_names[i],
+                "location_type": normalized_type,
+                "trailing_3m_yoy_change": float(yoy_changes[i].sum() / valid_counts[i]),
+                "valid_months_count": int(valid_counts[i]),
+                "monthly_data": [
+                    {
+                        "date": month,
+                        "overall": to_value(current["overall"][i, j]),
+                        "1br": to_value(current["1br"][i, j]),
+                        "2br": to_value(current["2br"][i, j]),
+                        "year_ago_overall": to_value(year_ago["overall"][i, j]),
+                        "year_ago_1br": to_value(year_ago["1br"][i, j]),
+                        "year_ago_2br": to_value(year_ago["2br"][i, j])
                     }
-                    
-                    if row["year_month"] in latest_months:
-                        current_data[row["year_month"]] = data_point
-                    elif row["year_month"] in year_ago_months:
-                        year_ago_data[row["year_month"]] = data_point
-                
-                # Calculate year-over-year changes
-                monthly_changes = []
-                current_rents = []
-                
-                for curr_month, year_ago_month in zip(latest_months, year_ago_months):
-                    curr_data = current_data.get(curr_month, {})
-                    year_ago_data_point = year_ago_data.get(year_ago_month, {})
-                    
-                    if curr_data and year_ago_data_point:
-                        curr_rent = curr_data.get("overall", 0)
-                        year_ago_rent = year_ago_data_point.get("overall", 0)
-                        
-                        if curr_rent > 0 and year_ago_rent > 0:
-                            yoy_change = ((curr_rent - year_ago_rent) / year_ago_rent) * 100
-                            monthly_changes.append(yoy_change)
-                            current_rents.append({
-                                "date": curr_month,
-                                "overall": curr_rent,
-                                "1br": curr_data.get("1br", 0),
-                                "2br": curr_data.get("2br", 0),
-                                "year_ago_overall": year_ago_rent,
-                                "year_ago_1br": year_ago_data_point.get("1br", 0),
-                                "year_ago_2br": year_ago_data_point.get("2br", 0)
-                            })
-                
-                if monthly_changes:
-                    avg_change = sum(monthly_changes) / len(monthly_changes)
-                    result.append({
-                        "location_name": location_name,
-                        "location_type": normalized_type,
-                        "trailing_3m_yoy_change": avg_change,
-                        "valid_months_count": len(monthly_changes),
-                        "monthly_data": current_rents
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error processing location {location_name}: {str(e)}")
-                continue
+                    for j, month in enumerate(latest_months)
+                    if valid[i, j]
+                ]
+            })
         
         return sorted(result, key=lambda x: x["trailing_3m_yoy_change"], reverse=True)
 
-    def get_location_time_series(
+    async def get_location_time_series(
         self,
         location_type: str,
         location_name: str
@@ -163,7 +146,7 @@ class RentDBClient(BaseDBClient):
 
         logger.info(f"Querying with normalized type: {normalized_type} for location: {location_name}")
         
-        response = self.client.table(self.table_name)\
+        response = await self.client.table(self.table_name)\
             .select("*")\
             .eq("location_type", normalized_type)\
             .eq("location_name", location_name)\
@@ -191,12 +174,11 @@ class RentDBClient(BaseDBClient):
             }
         }
         
-        # Create a map of year_month to data for YoY calculations
-        data_map = {item["year_month"]: item for item in response.data}
+        # Create a map of month code to data for YoY calculations
+        data_map = {month_code(item["year_month"]): item for item in response.data}
         
-        for item in response.data:
-            year, month = map(int, item["year_month"].split("_"))
-            year_ago = f"{year-1}_{month:02d}"
+        for code, item in data_map.items():
+            year_ago = code - MONTHS_PER_YEAR
             
             time_series["dates"].append(item["year_month"])
             
@@ -221,7 +203,7 @@ class RentDBClient(BaseDBClient):
         
         return time_series
 
-    def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
+    async def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
         """
         Get list of available locations for a specific type.
         
@@ -236,20 +218,21 @@ class RentDBClient(BaseDBClient):
             return []
             
         # Get latest month
-        latest_month = self.get_latest_months(1)[0]
+        latest_month = (await self.get_latest_months(1))[0]
         
         # Query only latest month's data
-        response = self.client.table(self.table_name)\
-            .select("location_name")\
-            .eq("location_type", normalized_type)\
-            .eq("year_month", latest_month)\
-            .execute()
-        
-        if not response.data:
+        buffer = await self.bulk_load(
+            ["location_name"],
+            apply_filters=lambda query: query
+                .eq("location_type", normalized_type)
+                .eq("year_month", latest_month)
+        )
+        
+        if not len(buffer):
             return []
         
         # Get unique location names
-        locations = list(set(item["location_name"] for item in response.data))
+        locations = list(set(buffer["location_name"]))
         return sorted([{
             "location_type": normalized_type,
             "location_name": name
@@ -6,6 +6,8 @@ Handles database operations for apartment rent estimates data.
 import logging
 from typing import List, Dict, Any, Optional
 from ..base import BaseDBClient
+from ..month_catalog import month_catalog
+from ..time_series import build_time_series
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -17,25 +19,36 @@ class RentRevDBClient(BaseDBClient):
         """Initialize database client."""
         super().__init__()
         self.table_name = 'apartment_list_rent_estimates_view'
-        self.summary_table = 'apartment_list_rent_estimates_summary_view'
         self.locations_table = 'apartment_list_rent_estimates_unique_locations_view'
+        self.value_columns = ['rent_estimate_overall', 'rent_estimate_1br', 'rent_estimate_2br']
+        self.summary_column = 'rent_estimate_overall'
+        self.summary_prefix = 'rent_estimate'
+        # Detail output key -> value column
+        self.detail_series = {
+            'rent_estimate': 'rent_estimate_overall',
+            'rent_estimate_1br': 'rent_estimate_1br',
+            'rent_estimate_2br': 'rent_estimate_2br'
+        }
         
-    def get_latest_months(self, count: int = 3) -> List[str]:
-        """Get the latest months from the database in YYYY_MM format."""
+    async def get_latest_months(self, count: int = 3) -> List[str]:
+        """Get the latest months in YYYY_MM format, newest first."""
         try:
-            response = self.client.table(self.table_name)\
-                .select("year_month")\
-                .order("year_month", desc=True)\
-                .limit(count)\
-                .execute()
-            
-            logger.info(f"Latest months response: {response.data}")
-            
-            if not response.data:
+            if self.has_snapshot():
+                snapshot = await self.get_snapshot()
+                latest_months = snapshot.latest_months(count)
+            else:
+                # Snapshot still cold: use the cached month catalog meanwhile
+                self.warm_snapshot()
+                latest_months = await month_catalog.get_latest_months(
+                    self.client,
+                    self.table_name,
+                    count
+                )
+            
+            if not latest_months:
                 logger.error(f"No data found in table {self.table_name}")
                 return []
             
-            latest_months = sorted([item["year_month"] for item in response.data], reverse=True)
             logger.info(f"Latest months: {latest_months}")
             return latest_months
             
@@ -43,7 +56,7 @@ class RentRevDBClient(BaseDBClient):
             logger.error(f"Error getting latest months: {str(e)}")
             return []
             
-    def get_location_data(self, location_type: str) -> List[Dict[str, Any]]:
+    async def get_location_data(self, location_type: str) -> List[Dict[str, Any]]:
         """
         Get rent data for locations of specified type.
         
@@ -54,23 +67,24 @@ class RentRevDBClient(BaseDBClient):
             List of location data dictionaries
         """
         try:
-            response = self.client.table(self.summary_table)\
-                .select('*')\
-                .eq('location_type', location_type)\
-                .execute()
-                
-            if response.data:
-                return response.data
-            return []
+            snapshot = await self.get_snapshot()
+            return snapshot.summary_rows(
+                location_type,
+                self.summary_column,
+                self.summary_prefix
+            )
             
         except Exception as e:
             logger.error(f"Error getting location data: {str(e)}")
             return []
             
-    def get_location_time_series(
+    async def get_location_time_series(
         self,
         location_type: str,
-        location_name: str
+        location_name: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        max_points: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Get time series data for a specific location.
@@ -78,6 +92,9 @@ class RentRevDBClient(BaseDBClient):
         Args:
             location_type: Type of location
             location_name: Name of location
+            start: First month code to include
+            end: Last month code to include
+            max_points: Maximum number of months, downsampled with LTTB
             
         Returns:
             Dictionary containing time series data
@@ -98,103 +115,31 @@ class RentRevDBClient(BaseDBClient):
             location_name = location_name.replace('%26', '&')  # 处理&符号
             logger.info(f"After URL decode - type: {location_type}, name: {location_name}")
             
-            # 获取所有时间序列数据
-            response = self.client.table(self.table_name)\
-                .select('*')\
-                .eq('location_type', location_type)\
-                .eq('location_name', location_name)\
-                .order('year_month')\
-                .execute()
-            
-            logger.info(f"Query response data count: {len(response.data) if response.data else 0}")
+            # 从内存快照获取所有时间序列数据，并统一向量化计算同比变化
+            snapshot = await self.get_snapshot()
+            time_series = build_time_series(
+                snapshot,
+                location_type,
+                location_name,
+                self.detail_series,
+                missing_yoy=0.0,  # 租金缺少去年同期数据时同比记为0
+                start=start,
+                end=end,
+                max_points=max_points
+            )
                 
-            if not response.data:
+            if not time_series:
                 logger.error(f"No data found for {location_type} {location_name}")
                 return {}
-                
-            # 处理时间序列数据
-            dates = []
-            values = {'overall': [], '1br': [], '2br': []}
-            yoy_changes = {'overall': [], '1br': [], '2br': []}
-            
-            # 创建一个字典来存储每个年份的数据，用于计算同比变化
-            yearly_data = {'overall': {}, '1br': {}, '2br': {}}
-            
-            for row in response.data:
-                year_month = row['year_month']
-                year = int(year_month.split('_')[0])
-                month = int(year_month.split('_')[1])
-                
-                # 处理每种租金类型的数据
-                rent_types = {
-                    'overall': 'rent_estimate_overall',
-                    '1br': 'rent_estimate_1br',
-                    '2br': 'rent_estimate_2br'
-                }
-                
-                for rent_type, column in rent_types.items():
-                    rent_value = row.get(column)
-                    if rent_value is not None:
-                        if year not in yearly_data[rent_type]:
-                            yearly_data[rent_type][year] = {}
-                        yearly_data[rent_type][year][month] = rent_value
-            
-            # 计算每个月的同比变化
-            sorted_data = sorted(response.data, key=lambda x: x['year_month'])
-            for row in sorted_data:
-                year_month = row['year_month']
-                year = int(year_month.split('_')[0])
-                month = int(year_month.split('_')[1])
-                
-                # 只在处理第一种租金类型时添加日期
-                dates.append(year_month)
-                
-                # 处理每种租金类型的数据
-                for rent_type, column in rent_types.items():
-                    rent_value = row.get(column)
-                    if rent_value is not None:
-                        values[rent_type].append(rent_value)
-                        
-                        # 计算同比变化
-                        prev_year = year - 1
-                        if (prev_year in yearly_data[rent_type] and 
-                            month in yearly_data[rent_type][prev_year]):
-                            prev_value = yearly_data[rent_type][prev_year][month]
-                            if prev_value != 0:  # 避免除以0
-                                yoy_change = ((rent_value - prev_value) / prev_value) * 100
-                            else:
-                                yoy_change = 0
-                        else:
-                            yoy_change = 0
-                        
-                        yoy_changes[rent_type].append(yoy_change)
-                    else:
-                        values[rent_type].append(None)
-                        yoy_changes[rent_type].append(None)
-            
-            logger.info(f"Processed {len(dates)} data points for {location_type} {location_name}")
-            
-            return {
-                'dates': dates,
-                'rent_estimate': {
-                    'values': values['overall'],
-                    'yoy_changes': yoy_changes['overall']
-                },
-                'rent_estimate_1br': {
-                    'values': values['1br'],
-                    'yoy_changes': yoy_changes['1br']
-                },
-                'rent_estimate_2br': {
-                    'values': values['2br'],
-                    'yoy_changes': yoy_changes['2br']
-                }
-            }
+            
+            logger.info(f"Processed {len(time_series['dates'])} data points for {location_type} {location_name}")
+            return time_series
             
         except Exception as e:
             logger.error(f"Error getting time series data: {str(e)}")
             return {}
             
-    def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
+    async def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
         """
         Get available locations for a specific type.
         
@@ -205,20 +150,24 @@ class RentRevDBClient(BaseDBClient):
             List of location dictionaries
         """
         try:
-            response = self.client.table(self.locations_table)\
-                .select('location_name')\
-                .eq('location_type', location_type)\
-                .execute()
-                
-            if response.data:
-                return response.data
-            return []
+            if self.has_snapshot():
+                snapshot = await self.get_snapshot()
+                names = snapshot.location_names(location_type)
+            else:
+                # Snapshot still cold: use the cached location catalog meanwhile
+                self.warm_snapshot()
+                names = await month_catalog.get_locations(
+                    self.client,
+                    self.table_name,
+                    location_type
+                )
+            return [{'location_name': name} for name in names]
             
         except Exception as e:
             logger.error(f"Error getting locations: {str(e)}")
             return []
             
-    def get_location_types(self) -> List[str]:
+    async def get_location_types(self) -> List[str]:
         """
         Get all available location types.
         
@@ -4,8 +4,11 @@ Handles data retrieval for apartment vacancy rates.
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
 from ..base import BaseDBClient
+from ..month_catalog import month_catalog
+from ..months import MONTHS_PER_YEAR, month_code, month_codes, month_labels
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,24 +21,17 @@ class VacancyDBClient(BaseDBClient):
         super().__init__()
         self.table_name: str = "apartment_list_vacancy_index_view"
 
-    def get_latest_months(self, count: int = 3) -> List[str]:
-        """Get the latest months from the database in YYYY_MM format."""
-        response = self.client.table(self.table_name)\
-            .select("year_month")\
-            .order("year_month", desc=True)\
-            .limit(count)\
-            .execute()
-        
-        logger.info(f"Latest months response: {response.data}")
+    async def get_latest_months(self, count: int = 3) -> List[str]:
+        """Get the latest distinct months from the month catalog in YYYY_MM format."""
+        latest_months = await month_catalog.get_latest_months(self.client, self.table_name, count)
         
-        if not response.data:
+        if not latest_months:
             raise ValueError(f"No data found in table {self.table_name}")
         
-        latest_months = sorted([item["year_month"] for item in response.data], reverse=True)
         logger.info(f"Latest months: {latest_months}")
         return latest_months
 
-    def get_location_data(self, location_type: str) -> List[Dict[str, Any]]:
+    async def get_location_data(self, location_type: str) -> List[Dict[str, Any]]:
         """
         Get vacancy data for specific location type.
         
@@ -51,102 +47,74 @@ class VacancyDBClient(BaseDBClient):
 
         logger.info(f"Querying with normalized type: {normalized_type}")
         
-        # Get all available locations for this type
-        locations_response = self.client.table(self.table_name)\
-            .select("location_name")\
-            .eq("location_type", normalized_type)\
-            .execute()
-        
-        if not locations_response.data:
+        # Latest 3 months and the same months one year earlier, as month codes
+        latest_codes = await month_catalog.get_latest_month_codes(self.client, self.table_name, 3)
+        if not len(latest_codes):
+            raise ValueError(f"No data found in table {self.table_name}")
+        latest_months = month_labels(latest_codes)
+        year_ago_codes = latest_codes - MONTHS_PER_YEAR
+        
+        # One bulk query for the six relevant months of every location
+        buffer = await self.bulk_load(
+            ["location_name", "year_month", "vacancy_index"],
+            numeric_columns=["vacancy_index"],
+            apply_filters=lambda query: query
+                .eq("location_type", normalized_type)
+                .in_("year_month", month_labels(np.concatenate([latest_codes, year_ago_codes])))
+        )
+        
+        if not len(buffer):
             logger.error(f"No locations found for type: {normalized_type}")
             return []
         
-        # Get recent months data
-        response = self.client.table(self.table_name)\
-            .select("year_month")\
-            .order("year_month", desc=True)\
-            .execute()
-            
-        if not response.data:
-            return []
-            
-        # Get unique months and sort them
-        all_months = sorted(list(set(item["year_month"] for item in response.data)), reverse=True)
-        latest_months = all_months[:3]  # Get the latest 3 unique months
-        
-        year_ago_months = [
-            f"{int(month.split('_')[0])-1}_{month.split('_')[1]}"
-            for month in latest_months
-        ]
+        # Pivot to a (location x month code) matrix and compute YoY for all locations at once
+        frame = buffer.to_frame()
+        frame["month"] = month_codes(buffer["year_month"])
+        matrix = frame.groupby(["location_name", "month"])["vacancy_index"]\
+            .first()\
+            .unstack()\
+            .reindex(columns=[*latest_codes, *year_ago_codes])
+        current = matrix[latest_codes].to_numpy(dtype=float)
+        year_ago = matrix[year_ago_codes].to_numpy(dtype=float)
+        
+        valid = ~np.isnan(current) & ~np.isnan(year_ago) & (year_ago > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            yoy_changes = np.where(valid, (current - year_ago) / year_ago * 100, np.nan)
+        valid_counts = valid.sum(axis=1)
+        totals = np.where(valid, yoy_changes, 0.0).sum(axis=1)
+        
+        def to_value(value: float) -> Optional[float]:
+            return None if np.isnan(value) else float(value)
         
-        # Process data for each location
         result = []
-        unique_locations = {item["location_name"] for item in locations_response.data}
-        
-        for location_name in unique_locations:
-            try:
-                # Get all data for this location
-                location_data = self.client.table(self.table_name)\
-                    .select("*")\
-                    .eq("location_type", normalized_type)\
-                    .eq("location_name", location_name)\
-                    .in_("year_month", [*latest_months, *year_ago_months])\
-                    .execute()
-                
-                if not location_data.data:
-                    continue
-                    
-                current_data = {}
-                year_ago_data = {}
-                
-                # Process data
-                for row in location_data.data:
-                    if row["year_month"] in latest_months:
-                        current_data[row["year_month"]] = row["vacancy_index"]
-                    elif row["year_month"] in year_ago_months:
-                        year_ago_data[row["year_month"]] = row["vacancy_index"]
-                
-                # Calculate year-over-year changes for each month
-                monthly_data = []
-                valid_months_count = 0
-                total_yoy_change = 0
-                
-                for current_month, year_ago_month in zip(latest_months, year_ago_months):
-                    current_rate = current_data.get(current_month)
-                    year_ago_rate = year_ago_data.get(year_ago_month)
-                    
-                    if current_rate is not None and year_ago_rate is not None and year_ago_rate > 0:
-                        yoy_change = ((current_rate - year_ago_rate) / year_ago_rate) * 100
-                        valid_months_count += 1
-                        total_yoy_change += yoy_change
-                    else:
-                        yoy_change = None
-                        
-                    monthly_data.append({
-                        "year_month": current_month,
-                        "vacancy_rate": current_rate,
-                        "year_ago_rate": year_ago_rate,
-                        "yoy_change": yoy_change
-                    })
-                
+        for i, location_name in enumerate(matrix.index):
+            valid_months_count = int(valid_counts[i])
+            result.append({
+                "location_name": location_name,
+                "location_type": normalized_type,
                 # Calculate trailing 3-month average YoY change
-                trailing_3m_yoy_change = (total_yoy_change / valid_months_count) if valid_months_count > 0 else None
-                
-                result.append({
-                    "location_name": location_name,
-                    "location_type": normalized_type,
-                    "trailing_3m_yoy_change": trailing_3m_yoy_change,
-                    "valid_months_count": valid_months_count,
-                    "monthly_data": monthly_data
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing location {location_name}: {str(e)}")
-                continue
-        
-        return sorted(result, key=lambda x: x.get("trailing_3m_yoy_change", float('-inf')), reverse=True)
+                "trailing_3m_yoy_change": (
+                    float(totals[i] / valid_months_count) if valid_months_count > 0 else None
+                ),
+                "valid_months_count": valid_months_count,
+                "monthly_data": [
+                    {
+                        "year_month": month,
+                        "vacancy_rate": to_value(current[i, j]),
+                        "year_ago_rate": to_value(year_ago[i, j]),
+                        "yoy_change": to_value(yoy_changes[i, j])
+                    }
+                    for j, month in enumerate(latest_months)
+                ]
+            })
+        
+        return sorted(
+            result,
+            key=lambda x: x["trailing_3m_yoy_change"] if x["trailing_3m_yoy_change"] is not None else float('-inf'),
+            reverse=True
+        )
 
-    def get_location_time_series(
+    async def get_location_time_series(
         self,
         location_type: str,
         location_name: str
@@ -167,7 +135,7 @@ class VacancyDBClient(BaseDBClient):
 
         logger.info(f"Querying with normalized type: {normalized_type} for location: {location_name}")
         
-        response = self.client.table(self.table_name)\
+        response = await self.client.table(self.table_name)\
             .select("*")\
             .eq("location_type", normalized_type)\
             .eq("location_name", location_name)\
@@ -187,12 +155,11 @@ class VacancyDBClient(BaseDBClient):
             }
         }
         
-        # Create a map of year_month to data for YoY calculations
-        data_map = {item["year_month"]: item for item in response.data}
+        # Create a map of month code to data for YoY calculations
+        data_map = {month_code(item["year_month"]): item for item in response.data}
         
-        for item in response.data:
-            year, month = map(int, item["year_month"].split("_"))
-            year_ago = f"{year-1}_{month:02d}"
+        for code, item in data_map.items():
+            year_ago = code - MONTHS_PER_YEAR
             
             time_series["dates"].append(item["year_month"])
             
@@ -215,7 +182,7 @@ class VacancyDBClient(BaseDBClient):
         
         return time_series
 
-    def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
+    async def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
         """
         Get list of available locations for a specific type.
         
@@ -230,18 +197,19 @@ class VacancyDBClient(BaseDBClient):
             return []
             
         # Get latest month
-        latest_month = self.get_latest_months(1)[0]
+        latest_month = (await self.get_latest_months(1))[0]
         
         # Query only latest month's data
-        response = self.client.table(self.table_name)\
-            .select("location_name")\
-            .eq("location_type", normalized_type)\
-            .eq("year_month", latest_month)\
-            .execute()
-        
-        if not response.data:
+        buffer = await self.bulk_load(
+            ["location_name"],
+            apply_filters=lambda query: query
+                .eq("location_type", normalized_type)
+                .eq("year_month", latest_month)
+        )
+        
+        if not len(buffer):
             return []
             
         # Get unique location names and sort them
-        unique_locations = sorted(list(set(item["location_name"] for item in response.data)))
+        unique_locations = sorted(list(set(buffer["location_name"])))
         return [{"location_name": name, "location_type": normalized_type} for name in unique_locations] 
\ No newline at end of file
@@ -6,6 +6,8 @@ Handles database operations for apartment vacancy rate data.
 import logging
 from typing import List, Dict, Any, Optional
 from ..base import BaseDBClient
+from ..month_catalog import month_catalog
+from ..time_series import build_time_series
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -17,25 +19,32 @@ class VacancyRevDBClient(BaseDBClient):
         """Initialize database client."""
         super().__init__()
         self.table_name = 'apartment_list_vacancy_index_view'
-        self.summary_table = 'apartment_list_vacancy_index_summary_view'
         self.locations_table = 'apartment_list_vacancy_unique_locations_view'
+        self.value_columns = ['vacancy_index']
+        self.summary_column = 'vacancy_index'
+        self.summary_prefix = 'vacancy'
+        # Detail output key -> value column
+        self.detail_series = {'vacancy_index': 'vacancy_index'}
         
-    def get_latest_months(self, count: int = 3) -> List[str]:
-        """Get the latest months from the database in YYYY_MM format."""
+    async def get_latest_months(self, count: int = 3) -> List[str]:
+        """Get the latest months in YYYY_MM format, newest first."""
         try:
-            response = self.client.table(self.table_name)\
-                .select("year_month")\
-                .order("year_month", desc=True)\
-                .limit(count)\
-                .execute()
-            
-            logger.info(f"Latest months response: {response.data}")
-            
-            if not response.data:
+            if self.has_snapshot():
+                snapshot = await self.get_snapshot()
+                latest_months = snapshot.latest_months(count)
+            else:
+                # Snapshot still cold: use the cached month catalog meanwhile
+                self.warm_snapshot()
+                latest_months = await month_catalog.get_latest_months(
+                    self.client,
+                    self.table_name,
+                    count
+                )
+            
+            if not latest_months:
                 logger.error(f"No data found in table {self.table_name}")
                 return []
             
-            latest_months = sorted([item["year_month"] for item in response.data], reverse=True)
             logger.info(f"Latest months: {latest_months}")
             return latest_months
             
@@ -43,7 +52,7 @@ class VacancyRevDBClient(BaseDBClient):
             logger.error(f"Error getting latest months: {str(e)}")
             return []
             
-    def get_location_data(self, location_type: str) -> List[Dict[str, Any]]:
+    async def get_location_data(self, location_type: str) -> List[Dict[str, Any]]:
         """
         Get vacancy data for locations of specified type.
         
@@ -54,23 +63,24 @@ class VacancyRevDBClient(BaseDBClient):
             List of location data dictionaries
         """
         try:
-            response = self.client.table(self.summary_table)\
-                .select('*')\
-                .eq('location_type', location_type)\
-                .execute()
-                
-            if response.data:
-                return response.data
-            return []
+            snapshot = await self.get_snapshot()
+            return snapshot.summary_rows(
+                location_type,
+                self.summary_column,
+                self.summary_prefix
+            )
             
         except Exception as e:
             logger.error(f"Error getting location data: {str(e)}")
             return []
             
-    def get_location_time_series(
+    async def get_location_time_series(
         self,
         location_type: str,
-        location_name: str
+        location_name: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        max_points: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Get time series data for a specific location.
@@ -78,6 +88,9 @@ class VacancyRevDBClient(BaseDBClient):
         Args:
             location_type: Type of location
             location_name: Name of location
+            start: First month code to include
+            end: Last month code to include
+            max_points: Maximum number of months, downsampled with LTTB
             
         Returns:
             Dictionary containing time series data
@@ -98,79 +111,30 @@ class VacancyRevDBClient(BaseDBClient):
             location_name = location_name.replace('%26', '&')  # 处理&符号
             logger.info(f"After URL decode - type: {location_type}, name: {location_name}")
             
-            # 获取所有时间序列数据
-            response = self.client.table(self.table_name)\
-                .select('*')\
-                .eq('location_type', location_type)\
-                .eq('location_name', location_name)\
-                .order('year_month')\
-                .execute()
-            
-            logger.info(f"Query response data count: {len(response.data) if response.data else 0}")
+            # 从内存快照获取所有时间序列数据，并统一向量化计算同比变化
+            snapshot = await self.get_snapshot()
+            time_series = build_time_series(
+                snapshot,
+                location_type,
+                location_name,
+                self.detail_series,
+                start=start,
+                end=end,
+                max_points=max_points
+            )
                 
-            if not response.data:
+            if not time_series:
                 logger.error(f"No data found for {location_type} {location_name}")
                 return {}
-                
-            # 处理时间序列数据
-            dates = []
-            values = []
-            yoy_changes = []
-            
-            # 创建一个字典来存储每个年份的数据，用于计算同比变化
-            yearly_data = {}
-            for row in response.data:
-                year_month = row['year_month']
-                year = int(year_month.split('_')[0])
-                month = int(year_month.split('_')[1])
-                vacancy_index = row.get('vacancy_index')
-                
-                if year not in yearly_data:
-                    yearly_data[year] = {}
-                yearly_data[year][month] = vacancy_index
-            
-            # 计算每个月的同比变化
-            sorted_data = sorted(response.data, key=lambda x: x['year_month'])
-            for row in sorted_data:
-                year_month = row['year_month']
-                dates.append(year_month)
-                
-                # 添加当前值（可以是 None）
-                vacancy_index = row.get('vacancy_index')
-                values.append(vacancy_index)
-                
-                # 计算同比变化
-                year = int(year_month.split('_')[0])
-                month = int(year_month.split('_')[1])
-                prev_year = year - 1
-                
-                if (vacancy_index is not None and 
-                    prev_year in yearly_data and 
-                    month in yearly_data[prev_year] and 
-                    yearly_data[prev_year][month] is not None and 
-                    yearly_data[prev_year][month] != 0):
-                    prev_value = yearly_data[prev_year][month]
-                    yoy_change = ((vacancy_index - prev_value) / prev_value) * 100
-                else:
-                    yoy_change = None
-                
-                yoy_changes.append(yoy_change)
             
-            logger.info(f"Processed {len(dates)} data points for {location_type} {location_name}")
-            
-            return {
-                'dates': dates,
-                'vacancy_index': {
-                    'values': values,
-                    'yoy_changes': yoy_changes
-                }
-            }
+            logger.info(f"Processed {len(time_series['dates'])} data points for {location_type} {location_name}")
+            return time_series
             
         except Exception as e:
             logger.error(f"Error getting time series data: {str(e)}")
             return {}
             
-    def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
+    async def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
         """
         Get available locations for a specific type.
         
@@ -181,20 +145,24 @@ class VacancyRevDBClient(BaseDBClient):
             List of location dictionaries
         """
         try:
-            response = self.client.table(self.locations_table)\
-                .select('location_name')\
-                .eq('location_type', location_type)\
-                .execute()
-                
-            if response.data:
-                return response.data
-            return []
+            if self.has_snapshot():
+                snapshot = await self.get_snapshot()
+                names = snapshot.location_names(location_type)
+            else:
+                # Snapshot still cold: use the cached location catalog meanwhile
+                self.warm_snapshot()
+                names = await month_catalog.get_locations(
+                    self.client,
+                    self.table_name,
+                    location_type
+                )
+            return [{'location_name': name} for name in names]
             
         except Exception as e:
             logger.error(f"Error getting locations: {str(e)}")
             return []
             
-    def get_location_types(self) -> List[str]:
+    async def get_location_types(self) -> List[str]:
         """
         Get all available location types.
         
@@ -202,13 +170,11 @@ class VacancyRevDBClient(BaseDBClient):
             List of location types
         """
         try:
-            response = self.client.table(self.locations_table)\
-                .select('location_type')\
-                .execute()
+            buffer = await self.bulk_load(['location_type'], table_name=self.locations_table)
                 
-            if response.data:
+            if len(buffer):
                 # Get unique location types
-                types = set(item['location_type'] for item in response.data)
+                types = set(buffer['location_type'])
                 return sorted(list(types))
             return []
             
@@ -1,13 +1,19 @@
 """
 Base database connection module.
-Handles connection to Supabase and common utilities.
+Handles async connection to Supabase PostgREST and common utilities.
 """
 
 import os
 import logging
-from typing import Optional
+from typing import Optional, List, Dict, Any, Callable, Sequence, Tuple
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from postgrest import AsyncPostgrestClient
+from .registry import client_registry
+from .bulk_loader import BulkLoader, ColumnarBuffer
+from .snapshot import ViewSnapshot, snapshot_store
+from .ranking import RankIndex
+from .time_series import build_rolling_stats
+from .data_version import data_version_monitor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,16 +26,196 @@ class BaseDBClient:
     """Base database client class with common functionality."""
     
     def __init__(self):
-        """Initialize Supabase client."""
+        """Attach the shared async Supabase PostgREST client."""
         self.url: str = os.getenv("SUPABASE_URL")
         self.key: str = os.getenv("SUPABASE_KEY")
         if not self.url or not self.key:
             raise ValueError("Missing Supabase credentials in environment variables")
         
-        # Create Supabase client
-        self.client: Client = create_client(
-            supabase_url=self.url,
-            supabase_key=self.key
+        # Share one pooled async PostgREST client across all database clients
+        self.client: AsyncPostgrestClient = client_registry.get_client(self.url, self.key)
+        
+    async def get_snapshot(self) -> ViewSnapshot:
+        """
+        Get the in-memory snapshot of this client's view.
+        
+        Subclasses must define ``table_name`` and ``value_columns``.
+        
+        Returns:
+            Snapshot of the view, loaded on first use
+        """
+        return await snapshot_store.get(self.client, self.table_name, self.value_columns)
+        
+    def has_snapshot(self) -> bool:
+        """Check whether this client's view is already held in memory."""
+        return snapshot_store.peek(self.table_name) is not None
+        
+    def warm_snapshot(self) -> None:
+        """Start loading this client's view snapshot in the background."""
+        snapshot_store.warm(self.client, self.table_name, self.value_columns)
+        
+    async def get_rank_index(
+        self,
+        location_type: str,
+        month_count: int = 3,
+        window: Optional[int] = None,
+        lag: int = 12
+    ) -> RankIndex:
+        """
+        Get the trailing-change rank ordering of a location type for the current data version.
+        
+        Subclasses must define ``summary_column`` and ``summary_prefix``.
+        
+        Args:
+            location_type: Type of location
+            month_count: Number of latest monthly values in the summary rows
+            window: Trailing months averaged (defaults to ``month_count``)
+            lag: Months between compared values (12 for YoY, 1 for MoM)
+            
+        Returns:
+            Rank index over the summary rows of the location type
+        """
+        snapshot = await self.get_snapshot()
+        return snapshot.rank_index(
+            location_type,
+            self.summary_column,
+            self.summary_prefix,
+            month_count,
+            window,
+            lag
+        )
+        
+    async def get_location_rolling_stats(
+        self,
+        location_type: str,
+        location_name: str,
+        windows: Sequence[int]
+    ) -> Dict[str, Any]:
+        """
+        Get rolling mean, rolling std and drawdown of a location from the snapshot.
+        
+        Subclasses must define ``detail_series``.
+        
+        Args:
+            location_type: Type of location
+            location_name: Name of location
+            windows: Rolling window lengths in months
+            
+        Returns:
+            Dictionary containing rolling statistics, or empty if the location is unknown
+        """
+        snapshot = await self.get_snapshot()
+        return build_rolling_stats(
+            snapshot,
+            location_type.strip(),
+            location_name.strip(),
+            self.detail_series,
+            windows
+        )
+        
+    async def get_data_version(self) -> Optional[str]:
+        """
+        Get the data version token of this client's view.
+        
+        While a reload for newer data is still being built, this is the
+        version of the snapshot being served, so results are never cached
+        under a version they were not computed from.
+        
+        Returns:
+            Version token (newest month and row count), or None if unknown
+        """
+        version = await data_version_monitor.get_version(self.client, self.table_name)
+        return snapshot_store.peek_version(self.table_name) or version
+        
+    async def call_function(self, name: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Call a Postgres function through PostgREST RPC.
+        
+        Args:
+            name: Function name (see app/sql/functions.sql)
+            params: Function arguments
+            
+        Returns:
+            Rows returned by the function
+        """
+        query = await self.client.rpc(name, params)
+        response = await query.execute()
+        return response.data or []
+        
+    async def get_ranked_locations(
+        self,
+        location_type: str,
+        top_count: int,
+        month_count: int = 3
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str]]:
+        """
+        Get top and bottom locations by trailing YoY change, ranked in Postgres.
+        
+        Only the ranked rows leave the database. Subclasses must define
+        ``table_name``, ``summary_column`` and ``summary_prefix``.
+        
+        Args:
+            location_type: Type of location
+            top_count: Number of locations in each group
+            month_count: Number of trailing months
+            
+        Returns:
+            Tuple of (top_locations, bottom_locations, latest_months) where the
+            location dictionaries are shaped like the summary views
+        """
+        rows = await self.call_function("get_ranked_yoy_locations", {
+            "table_name": self.table_name,
+            "metric_column": self.summary_column,
+            "loc_type": location_type,
+            "month_count": month_count,
+            "top_k": top_count
+        })
+        if not rows:
+            return [], [], []
+            
+        latest_months = rows[0]["latest_months"]
+        groups: Dict[str, List[Dict[str, Any]]] = {"top": [], "bottom": []}
+        for row in rows:
+            values = dict(zip(row["year_months"], row["month_values"]))
+            location = {
+                "location_type": location_type,
+                "location_name": row["location_name"]
+            }
+            for n, month in enumerate(latest_months, start=1):
+                location[f"month{n}_year_month"] = month
+                location[f"month{n}_{self.summary_prefix}"] = values.get(month)
+            location["yoy_change"] = row["yoy_change"]
+            groups[row["rank_group"]].append(location)
+            
+        return groups["top"], groups["bottom"], latest_months
+        
+    async def bulk_load(
+        self,
+        columns: Sequence[str],
+        numeric_columns: Sequence[str] = (),
+        apply_filters: Optional[Callable[[Any], Any]] = None,
+        order_by: Optional[Sequence[str]] = None,
+        table_name: Optional[str] = None
+    ) -> ColumnarBuffer:
+        """
+        Load all matching rows in parallel pages, bypassing the PostgREST row cap.
+        
+        Args:
+            columns: Columns to select
+            numeric_columns: Subset of columns stored as float64
+            apply_filters: Callable adding filters to the select query builder
+            order_by: Columns giving a stable row order (defaults to ``columns``)
+            table_name: View to read (defaults to ``self.table_name``)
+            
+        Returns:
+            Columnar buffer with all rows
+        """
+        return await BulkLoader(self.client).load(
+            table_name or self.table_name,
+            columns,
+            numeric_columns=numeric_columns,
+            apply_filters=apply_filters,
+            order_by=order_by
         )
         
     def normalize_location_type(self, location_type: str) -> Optional[str]:
@@ -0,0 +1,201 @@
+"""
+Bulk loader module.
+Reads whole views in parallel Range-header pages into compact columnar buffers.
+"""
+
+import os
+import math
+import time
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Callable, Sequence
+import numpy as np
+import pandas as pd
+from postgrest import AsyncPostgrestClient
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# PostgREST default max-rows; every page request asks for exactly this many rows
+PAGE_SIZE = 1000
+
+
+class ColumnarBuffer:
+    """
+    Preallocated column arrays filled page by page.
+
+    Numeric columns are float64 arrays with NaN for nulls; every other column
+    is an object array. Pages are written into their slice as soon as they
+    arrive, so only the in-flight pages are ever held as row dictionaries.
+    """
+
+    def __init__(self, columns: Sequence[str], numeric_columns: Sequence[str], capacity: int):
+        """
+        Initialize buffer.
+
+        Args:
+            columns: Column names in select order
+            numeric_columns: Columns stored as float64
+            capacity: Initial number of rows to allocate
+        """
+        self.numeric_columns = set(numeric_columns)
+        self.columns: Dict[str, np.ndarray] = {
+            column: self._allocate(column, capacity) for column in columns
+        }
+        self.size = 0
+        self.stats: Dict[str, Any] = {}
+
+    def _allocate(self, column: str, capacity: int) -> np.ndarray:
+        """Allocate an empty array for a column."""
+        if column in self.numeric_columns:
+            return np.full(capacity, np.nan)
+        return np.empty(capacity, dtype=object)
+
+    def write(self, offset: int, rows: List[Dict[str, Any]]) -> None:
+        """
+        Copy a page of rows into the buffer at a row offset, growing it if needed.
+
+        Args:
+            offset: Index of the first row of the page
+            rows: Page rows
+        """
+        end = offset + len(rows)
+        capacity = len(next(iter(self.columns.values()))) if self.columns else 0
+        if end > capacity:
+            new_capacity = max(end, capacity * 2)
+            for column, array in self.columns.items():
+                grown = self._allocate(column, new_capacity)
+                grown[:capacity] = array
+                self.columns[column] = grown
+
+        for column, array in self.columns.items():
+            if column in self.numeric_columns:
+                array[offset:end] = np.array([row.get(column) for row in rows], dtype=np.float64)
+            else:
+                array[offset:end] = [row.get(column) for row in rows]
+        self.size = max(self.size, end)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Get the filled part of a column."""
+        return self.columns[column][:self.size]
+
+    def __len__(self) -> int:
+        """Number of rows loaded."""
+        return self.size
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convert the buffer to a pandas DataFrame."""
+        return pd.DataFrame({column: self[column] for column in self.columns})
+
+
+class BulkLoader:
+    """Parallel, range-paginated reader that bypasses the PostgREST row cap."""
+
+    def __init__(
+        self,
+        client: AsyncPostgrestClient,
+        page_size: int = PAGE_SIZE,
+        max_concurrency: Optional[int] = None
+    ):
+        """
+        Initialize loader.
+
+        Args:
+            client: PostgREST client
+            page_size: Rows per Range page; must not exceed the server max-rows
+            max_concurrency: Maximum pages in flight (defaults to SUPABASE_BULK_CONCURRENCY)
+        """
+        self.client = client
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency or int(os.getenv("SUPABASE_BULK_CONCURRENCY", "6"))
+
+    async def load(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        numeric_columns: Sequence[str] = (),
+        apply_filters: Optional[Callable[[Any], Any]] = None,
+        order_by: Optional[Sequence[str]] = None
+    ) -> ColumnarBuffer:
+        """
+        Load every matching row of a view.
+
+        The first page is requested with an exact count, the remaining pages are
+        then fetched concurrently with bounded parallelism and streamed into a
+        columnar buffer.
+
+        Args:
+            table_name: Name of the view
+            columns: Columns to select
+            numeric_columns: Subset of columns stored as float64
+            apply_filters: Callable adding filters to a select query builder
+            order_by: Columns giving a stable, unique row order (defaults to ``columns``)
+
+        Returns:
+            Columnar buffer holding all rows, with timing in ``stats``
+        """
+        started = time.perf_counter()
+        order_by = list(order_by or columns)
+
+        def build_query(count: Optional[str] = None):
+            query = self.client.table(table_name).select(",".join(columns), count=count)
+            if apply_filters is not None:
+                query = apply_filters(query)
+            for column in order_by:
+                query = query.order(column)
+            return query
+
+        # First page doubles as the count probe
+        first = await build_query(count="exact").range(0, self.page_size).execute()
+        first_page = first.data or []
+        total = first.count if first.count is not None else len(first_page)
+        page_count = max(1, math.ceil(total / self.page_size))
+
+        buffer = ColumnarBuffer(columns, numeric_columns, total)
+        buffer.write(0, first_page)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pages_done = 1
+        next_milestone = 0.25
+
+        async def fetch_page(page: int) -> int:
+            nonlocal pages_done, next_milestone
+            offset = page * self.page_size
+            async with semaphore:
+                response = await build_query().range(offset, offset + self.page_size).execute()
+            rows = response.data or []
+            buffer.write(offset, rows)
+            pages_done += 1
+            if pages_done / page_count >= next_milestone:
+                logger.info(
+                    f"Bulk load {table_name}: {pages_done}/{page_count} pages "
+                    f"({time.perf_counter() - started:.2f}s)"
+                )
+                next_milestone += 0.25
+            return len(rows)
+
+        last_page_rows = len(first_page)
+        if page_count > 1:
+            sizes = await asyncio.gather(*(fetch_page(page) for page in range(1, page_count)))
+            last_page_rows = sizes[-1]
+
+        # Rows added after the count probe: keep reading until a short page
+        page = page_count
+        while last_page_rows == self.page_size:
+            page_count += 1
+            last_page_rows = await fetch_page(page)
+            page += 1
+
+        elapsed = time.perf_counter() - started
+        buffer.stats = {
+            "table_name": table_name,
+            "rows": len(buffer),
+            "pages": page_count,
+            "concurrency": self.max_concurrency,
+            "seconds": elapsed
+        }
+        logger.info(
+            f"Bulk loaded {len(buffer)} rows from {table_name} in {page_count} pages "
+            f"in {elapsed:.2f}s ({len(buffer) / elapsed if elapsed > 0 else 0:.0f} rows/s)"
+        )
+        return buffer
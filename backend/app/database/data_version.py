@@ -0,0 +1,217 @@
+"""
+Data version module.
+Detects new Apartment List data and publishes a version token per view.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Callable, Hashable
+from postgrest import AsyncPostgrestClient
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class DataVersionMonitor:
+    """
+    Background probe of the data version of each watched view.
+
+    The version token is the newest ``year_month`` plus the exact row count
+    (e.g. ``"2025_02:48213"``). Subscribers are notified whenever a view's
+    token changes, so caches can be held indefinitely and dropped exactly
+    when a new month lands.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        """
+        Initialize monitor.
+
+        Args:
+            interval: Seconds between background probes (defaults to DATA_VERSION_CHECK_INTERVAL)
+        """
+        self.interval = interval if interval is not None else float(
+            os.getenv("DATA_VERSION_CHECK_INTERVAL", "900")
+        )
+        self._clients: Dict[str, AsyncPostgrestClient] = {}
+        self._versions: Dict[str, str] = {}
+        self._changed_at: Dict[str, float] = {}
+        self._subscribers: List[Callable[[str, str], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Register a callback invoked as ``callback(table_name, version)`` on version changes.
+
+        Args:
+            callback: Synchronous callable
+        """
+        self._subscribers.append(callback)
+
+    def peek_version(self, table_name: str) -> Optional[str]:
+        """Get the last known version of a view without probing."""
+        return self._versions.get(table_name)
+
+    def peek_changed_at(self, table_name: str) -> Optional[float]:
+        """Get the UNIX time at which the current version of a view was first seen."""
+        return self._changed_at.get(table_name)
+
+    async def get_version(self, client: AsyncPostgrestClient, table_name: str) -> Optional[str]:
+        """
+        Get the current version of a view, probing it once if still unknown.
+
+        The view is added to the set watched by the background probe.
+
+        Args:
+            client: PostgREST client
+            table_name: Name of the view
+
+        Returns:
+            Version token, or None if the view cannot be probed
+        """
+        self._clients.setdefault(table_name, client)
+        version = self._versions.get(table_name)
+        if version is None:
+            version = await self._check(table_name)
+        return version
+
+    async def probe(self, client: AsyncPostgrestClient, table_name: str) -> Optional[str]:
+        """
+        Read the version token of a view.
+
+        Args:
+            client: PostgREST client
+            table_name: Name of the view
+
+        Returns:
+            Version token, or None if the view is empty
+        """
+        response = await client.table(table_name)\
+            .select("year_month", count="exact")\
+            .order("year_month", desc=True)\
+            .limit(1)\
+            .execute()
+        if not response.data:
+            return None
+        return f"{response.data[0]['year_month']}:{response.count}"
+
+    async def _check(self, table_name: str) -> Optional[str]:
+        """Probe one view and publish its version if it changed."""
+        try:
+            version = await self.probe(self._clients[table_name], table_name)
+        except Exception as e:
+            logger.error(f"Error probing data version of {table_name}: {str(e)}")
+            return self._versions.get(table_name)
+
+        previous = self._versions.get(table_name)
+        if version is None or version == previous:
+            return previous
+
+        self._versions[table_name] = version
+        self._changed_at[table_name] = time.time()
+        if previous is not None:
+            logger.info(f"Data version of {table_name} changed: {previous} -> {version}")
+            for callback in self._subscribers:
+                try:
+                    callback(table_name, version)
+                except Exception as e:
+                    logger.error(f"Error in data version subscriber: {str(e)}")
+        return version
+
+    async def check_all(self) -> None:
+        """Probe every watched view concurrently."""
+        await asyncio.gather(*(self._check(table_name) for table_name in list(self._clients)))
+
+    async def _run(self) -> None:
+        """Background probe loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check_all()
+
+    def start(self) -> None:
+        """Start the background probe loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Data version monitor started (interval {self.interval:.0f}s)")
+
+    async def stop(self) -> None:
+        """Stop the background probe loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class VersionedCache:
+    """
+    Result cache bound to a single data version.
+
+    Entries live until a different version is written, at which point the
+    whole cache is dropped. Cache keys come from client-chosen parameters
+    (month ranges, point counts, windows), so the number of entries is
+    capped and the least recently used ones are evicted beyond it.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize empty cache.
+
+        Args:
+            max_entries: Maximum number of cached results (defaults to VERSIONED_CACHE_MAX_ENTRIES)
+        """
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.getenv("VERSIONED_CACHE_MAX_ENTRIES", "2048")
+        )
+        self.version: Optional[str] = None
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, version: Optional[str], key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value for the given data version.
+
+        Args:
+            version: Current data version
+            key: Cache key
+
+        Returns:
+            Cached value, or None on miss or version mismatch
+        """
+        if version is None or version != self.version:
+            return None
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, version: Optional[str], key: Hashable, value: Any) -> None:
+        """
+        Cache a value under the given data version.
+
+        Args:
+            version: Data version the value was computed from; None disables caching
+            key: Cache key
+            value: Value to cache
+        """
+        if version is None:
+            return
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self.version = None
+
+
+# Process-wide data version monitor
+data_version_monitor = DataVersionMonitor()
@@ -0,0 +1,397 @@
+"""
+Forecast module.
+Fits trend/seasonal forecasts for every location of a view snapshot at once.
+
+The model is additive Holt-Winters exponential smoothing with a damped
+trend. Smoothing parameters are picked per location from a small grid by
+one-step-ahead squared error; all grid points and all locations of a type
+are evaluated together as (grid, locations) arrays, so the only Python loop
+is over months.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import product
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from .months import MONTHS_PER_YEAR, month_labels
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Smoothing parameter grid (level, trend, season) and trend damping
+ALPHAS = (0.2, 0.5, 0.8)
+BETAS = (0.01, 0.1, 0.3)
+GAMMAS = (0.05, 0.2, 0.5)
+PHI = 0.98
+
+# Two-sided 95% prediction interval
+INTERVAL = 0.95
+Z_SCORE = 1.96
+
+# A location is forecast only if it was observed within this many final months
+MAX_STALE_MONTHS = 3
+
+FORECAST_METHOD = "holt_winters_damped"
+
+# Shared worker pool for batch forecast precompute, created on first use
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+class ForecastResult:
+    """Forecasts of one value column for every location of a snapshot."""
+
+    def __init__(self, first_month: int, horizon: int, location_count: int):
+        """
+        Initialize empty result.
+
+        Args:
+            first_month: Month code of the first forecast month
+            horizon: Number of forecast months
+            location_count: Number of snapshot locations
+        """
+        self.first_month = first_month
+        self.horizon = horizon
+        self.values = np.full((location_count, horizon), np.nan)
+        self.lower = np.full((location_count, horizon), np.nan)
+        self.upper = np.full((location_count, horizon), np.nan)
+        self.fitted = np.zeros(location_count, dtype=bool)
+
+    @property
+    def dates(self) -> List[str]:
+        """Forecast months in YYYY_MM format."""
+        return month_labels(range(self.first_month, self.first_month + self.horizon))
+
+    def fill(
+        self,
+        rows: np.ndarray,
+        values: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        fitted: np.ndarray
+    ) -> None:
+        """
+        Store the forecasts of a group of snapshot rows.
+
+        Args:
+            rows: Snapshot row indices
+            values: (rows, horizon) point forecasts
+            lower: (rows, horizon) lower interval bounds
+            upper: (rows, horizon) upper interval bounds
+            fitted: (rows,) mask of rows with a usable forecast
+        """
+        self.values[rows] = values
+        self.lower[rows] = lower
+        self.upper[rows] = upper
+        self.fitted[rows] = fitted
+
+
+def holt_winters(
+    series: np.ndarray,
+    horizon: int,
+    season_length: int = MONTHS_PER_YEAR
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Forecast many monthly series with damped additive Holt-Winters.
+
+    Missing months (NaN) do not update the state; the model simply carries
+    its one-step prediction forward.
+
+    Args:
+        series: (locations, months) float64 matrix on a dense month axis
+        horizon: Number of months to forecast
+        season_length: Months per seasonal cycle
+
+    Returns:
+        Tuple of (forecast, lower, upper, fitted) where the first three are
+        (locations, horizon) arrays and ``fitted`` masks locations with
+        enough observations for a forecast
+    """
+    location_count, month_count = series.shape
+    m = season_length
+    empty = np.full((location_count, horizon), np.nan)
+    if month_count < 2 * m:
+        return empty, empty.copy(), empty.copy(), np.zeros(location_count, dtype=bool)
+
+    grid = np.array(list(product(ALPHAS, BETAS, GAMMAS)))
+    alpha = grid[:, 0, None]
+    beta = grid[:, 1, None]
+    gamma = grid[:, 2, None]
+
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"), warnings.catch_warnings():
+        # Locations without data in the first seasons get a NaN state and are not fitted
+        warnings.simplefilter("ignore", RuntimeWarning)
+
+        # Initial state from the first two seasons
+        first = series[:, :m]
+        level0 = np.nanmean(first, axis=1)
+        trend0 = np.nan_to_num((np.nanmean(series[:, m:2 * m], axis=1) - level0) / m)
+        season0 = np.nan_to_num(first - level0[:, None])
+
+        grid_size = len(grid)
+        level = np.broadcast_to(level0, (grid_size, location_count)).copy()
+        trend = np.broadcast_to(trend0, (grid_size, location_count)).copy()
+        season = np.broadcast_to(season0, (grid_size, location_count, m)).copy()
+        sse = np.zeros((grid_size, location_count))
+        observed = np.zeros(location_count)
+
+        for t in range(m, month_count):
+            y = series[:, t]
+            ok = ~np.isnan(y)
+            s = season[:, :, t % m]
+            damped = level + PHI * trend
+            error = np.where(ok, y - (damped + s), 0.0)
+            sse += error ** 2
+            observed += ok
+
+            new_level = np.where(ok, alpha * (y - s) + (1 - alpha) * damped, damped)
+            trend = np.where(ok, beta * (new_level - level) + (1 - beta) * PHI * trend, PHI * trend)
+            season[:, :, t % m] = np.where(ok, gamma * (y - new_level) + (1 - gamma) * s, s)
+            level = new_level
+
+        # Best grid point per location
+        best = np.argmin(np.where(np.isnan(sse), np.inf, sse), axis=0)
+        columns = np.arange(location_count)
+        level = level[best, columns]
+        trend = trend[best, columns]
+        season = season[best, columns]
+        a, b, g = grid[best].T
+        sigma = np.sqrt(sse[best, columns] / np.maximum(observed - 3, 1))
+
+        steps = np.arange(1, horizon + 1)
+        damping = np.cumsum(PHI ** steps)
+        season_idx = (month_count - 1 + steps) % m
+        forecast = level[:, None] + damping[None, :] * trend[:, None] + season[:, season_idx]
+
+        # h-step variance multiplier: 1 + sum_{j<h} c_j^2
+        c = a[:, None] * (1 + b[:, None] * damping[None, :-1]) \
+            + g[:, None] * (steps[None, :-1] % m == 0)
+        variance = np.concatenate([np.zeros((location_count, 1)), np.cumsum(c ** 2, axis=1)], axis=1)
+        multiplier = np.sqrt(1 + variance)
+        margin = Z_SCORE * sigma[:, None] * multiplier
+
+    recent = ~np.isnan(series[:, -MAX_STALE_MONTHS:]).all(axis=1)
+    fitted = (observed >= 2 * m) & recent \
+        & np.isfinite(forecast).all(axis=1) & np.isfinite(margin).all(axis=1)
+    return forecast, forecast - margin, forecast + margin, fitted
+
+
+def fit_forecasts(
+    snapshot: Any,
+    horizon: Optional[int] = None,
+    window: Optional[int] = None
+) -> Dict[str, ForecastResult]:
+    """
+    Fit forecasts for every value column and location type of a snapshot.
+
+    Args:
+        snapshot: ViewSnapshot to forecast
+        horizon: Months to forecast (defaults to FORECAST_HORIZON)
+        window: Trailing months used for fitting (defaults to FORECAST_WINDOW)
+
+    Returns:
+        Mapping of value column to forecast result
+    """
+    horizon = horizon or int(os.getenv("FORECAST_HORIZON", "12"))
+    window = window or int(os.getenv("FORECAST_WINDOW", "60"))
+    started = time.perf_counter()
+
+    forecasts: Dict[str, ForecastResult] = {}
+    if not len(snapshot.month_codes):
+        return forecasts
+
+    first_month = int(snapshot.month_codes[-1]) + 1
+    for column, matrix in snapshot.values.items():
+        result = ForecastResult(first_month, horizon, len(snapshot.locations))
+        for rows in snapshot.type_rows.values():
+            result.fill(rows, *holt_winters(matrix[rows, -window:], horizon))
+        forecasts[column] = result
+
+    logger.info(
+        f"Fitted {FORECAST_METHOD} forecasts for {snapshot.table_name}: "
+        f"{len(snapshot.locations)} locations x {len(forecasts)} columns "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return forecasts
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Get the shared forecast process pool, creating it on first use.
+
+    Workers are started by a forkserver rather than forked from the
+    running server, whose threads and held locks a forked child would
+    inherit; chunks only carry NumPy arrays, so no inherited state is needed.
+
+    Returns:
+        Process pool sized by FORECAST_WORKERS (defaults to every core)
+    """
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("FORECAST_WORKERS", "0")) or os.cpu_count() or 1
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("forkserver")
+        )
+        logger.info(f"Started forecast process pool with {workers} workers")
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared forecast process pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Forget a broken forecast process pool so the next precompute starts a new one.
+
+    Pending work of other views is not cancelled: a broken pool already
+    fails every outstanding future, and each view falls back on its own.
+    """
+    global _executor
+    if _executor is executor:
+        _executor = None
+    executor.shutdown(wait=False)
+
+
+def _fit_chunk(
+    series: np.ndarray,
+    horizon: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float, int]:
+    """Fit one chunk in a worker process and report its timing and worker pid."""
+    started = time.perf_counter()
+    result = holt_winters(series, horizon)
+    return (*result, time.perf_counter() - started, os.getpid())
+
+
+async def precompute_forecasts(
+    snapshot: Any,
+    horizon: Optional[int] = None,
+    window: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> Dict[str, ForecastResult]:
+    """
+    Fit forecasts for a whole snapshot in the shared process pool.
+
+    Every value column and location type is split into chunks of at most
+    ``chunk_size`` locations; chunks are fitted concurrently on all workers
+    and written into compact per-column result arrays. Falls back to
+    in-process fitting if the pool is unavailable.
+
+    Args:
+        snapshot: ViewSnapshot to forecast
+        horizon: Months to forecast (defaults to FORECAST_HORIZON)
+        window: Trailing months used for fitting (defaults to FORECAST_WINDOW)
+        chunk_size: Locations per chunk (defaults to FORECAST_CHUNK_SIZE)
+
+    Returns:
+        Mapping of value column to forecast result
+    """
+    horizon = horizon or int(os.getenv("FORECAST_HORIZON", "12"))
+    window = window or int(os.getenv("FORECAST_WINDOW", "60"))
+    chunk_size = chunk_size or int(os.getenv("FORECAST_CHUNK_SIZE", "500"))
+    started = time.perf_counter()
+
+    forecasts: Dict[str, ForecastResult] = {}
+    if not len(snapshot.month_codes):
+        return forecasts
+
+    first_month = int(snapshot.month_codes[-1]) + 1
+    chunks = []
+    for column, matrix in snapshot.values.items():
+        forecasts[column] = ForecastResult(first_month, horizon, len(snapshot.locations))
+        for location_type, rows in snapshot.type_rows.items():
+            for start in range(0, len(rows), chunk_size):
+                chunk_rows = rows[start:start + chunk_size]
+                chunks.append((column, location_type, chunk_rows, matrix[chunk_rows, -window:]))
+
+    try:
+        executor = get_executor()
+    except Exception as e:
+        logger.warning(f"Forecast process pool unavailable, fitting in-process: {str(e)}")
+        return await asyncio.to_thread(fit_forecasts, snapshot, horizon, window)
+
+    loop = asyncio.get_running_loop()
+    done = 0
+    busy = 0.0
+    workers = set()
+
+    async def run_chunk(column: str, location_type: str, rows: np.ndarray, series: np.ndarray) -> None:
+        nonlocal done, busy
+        *result, seconds, pid = await loop.run_in_executor(executor, _fit_chunk, series, horizon)
+        forecasts[column].fill(rows, *result)
+        done += 1
+        busy += seconds
+        workers.add(pid)
+        logger.info(
+            f"Forecast chunk {done}/{len(chunks)} of {snapshot.table_name}: "
+            f"{column} {location_type} {len(rows)} locations in {seconds:.3f}s (pid {pid})"
+        )
+
+    # Chunk failures (including futures cancelled by a pool shutdown) are
+    # collected rather than raised; only cancelling this task propagates
+    outcomes = await asyncio.gather(*(run_chunk(*chunk) for chunk in chunks), return_exceptions=True)
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if failures:
+        logger.warning(
+            f"Forecast process pool failed on {len(failures)}/{len(chunks)} chunks of "
+            f"{snapshot.table_name}, fitting in-process: {failures[0]!r}"
+        )
+        if any(isinstance(failure, BrokenProcessPool) for failure in failures):
+            _discard_executor(executor)
+        return await asyncio.to_thread(fit_forecasts, snapshot, horizon, window)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Precomputed {FORECAST_METHOD} forecasts for {snapshot.table_name}: "
+        f"{len(snapshot.locations)} locations x {len(forecasts)} columns in {len(chunks)} chunks "
+        f"on {len(workers)} workers in {elapsed:.2f}s "
+        f"(chunk time {busy:.2f}s, speedup {busy / elapsed if elapsed > 0 else 0:.1f}x)"
+    )
+    return forecasts
+
+
+def forecast_series(
+    forecasts: Dict[str, ForecastResult],
+    location: int,
+    series: Dict[str, str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the JSON-ready forecast block of one location.
+
+    Args:
+        forecasts: Mapping of value column to forecast result
+        location: Snapshot row index
+        series: Mapping of output key to value column
+
+    Returns:
+        Dictionary with method, interval, dates and one ``{values, lower, upper}``
+        entry per forecast output key, or None if nothing was fitted
+    """
+    block: Dict[str, Any] = {}
+    for key, column in series.items():
+        result = forecasts.get(column)
+        if result is None or not result.fitted[location]:
+            continue
+        if "dates" not in block:
+            block.update({
+                "method": FORECAST_METHOD,
+                "interval": INTERVAL,
+                "dates": result.dates
+            })
+        block[key] = {
+            "values": result.values[location].tolist(),
+            "lower": result.lower[location].tolist(),
+            "upper": result.upper[location].tolist()
+        }
+    return block or None
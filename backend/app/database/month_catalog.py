@@ -0,0 +1,173 @@
+"""
+Month catalog module.
+Caches the distinct months and locations of each view using the SQL functions in app/sql/functions.sql.
+"""
+
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+import numpy as np
+from postgrest import AsyncPostgrestClient
+from .data_version import data_version_monitor
+from .months import month_codes, month_labels
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Upper bound for "all months" requests (50 years of monthly data)
+MAX_MONTHS = 600
+
+
+class _ViewCatalog:
+    """Cached catalog entries of a single view."""
+
+    def __init__(self):
+        """Initialize empty entry."""
+        self.version: Optional[str] = None
+        self.months: np.ndarray = np.empty(0, dtype=np.int64)
+        self.locations: Dict[str, List[str]] = {}
+        self.lock = asyncio.Lock()
+
+
+class MonthCatalog:
+    """
+    Process-wide cache of distinct months and locations per view.
+
+    Entries are keyed on the data version published by the data version
+    monitor: the month list and location lists are refetched only when the
+    version of a view changes.
+    """
+
+    def __init__(self):
+        """Initialize empty catalog."""
+        self._views: Dict[str, _ViewCatalog] = {}
+
+    async def _call(
+        self,
+        client: AsyncPostgrestClient,
+        name: str,
+        params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Call a catalog SQL function through PostgREST RPC."""
+        query = await client.rpc(name, params)
+        response = await query.execute()
+        return response.data or []
+
+    async def _refresh(self, client: AsyncPostgrestClient, table_name: str) -> _ViewCatalog:
+        """Reload the month list of a view if its data version changed."""
+        entry = self._views.setdefault(table_name, _ViewCatalog())
+        version = await data_version_monitor.get_version(client, table_name)
+        if len(entry.months) and entry.version == version:
+            return entry
+
+        async with entry.lock:
+            if len(entry.months) and entry.version == version:
+                return entry
+
+            rows = await self._call(client, "get_latest_months", {
+                "table_name": table_name,
+                "month_count": MAX_MONTHS
+            })
+            entry.months = month_codes([row["year_month"] for row in rows])
+            entry.locations = {}
+            entry.version = version
+            logger.info(f"Month catalog of {table_name} refreshed: {len(entry.months)} months, version {version}")
+        return entry
+
+    async def get_months(self, client: AsyncPostgrestClient, table_name: str) -> List[str]:
+        """
+        Get every distinct month of a view, newest first.
+
+        Args:
+            client: PostgREST client
+            table_name: Name of the view
+
+        Returns:
+            List of months in YYYY_MM format
+        """
+        entry = await self._refresh(client, table_name)
+        return month_labels(entry.months)
+
+    async def get_latest_months(
+        self,
+        client: AsyncPostgrestClient,
+        table_name: str,
+        count: int = 3
+    ) -> List[str]:
+        """
+        Get the latest distinct months of a view, newest first.
+
+        Args:
+            client: PostgREST client
+            table_name: Name of the view
+            count: Number of months
+
+        Returns:
+            List of months in YYYY_MM format
+        """
+        entry = await self._refresh(client, table_name)
+        return month_labels(entry.months[:count])
+
+    async def get_latest_month_codes(
+        self,
+        client: AsyncPostgrestClient,
+        table_name: str,
+        count: int = 3
+    ) -> np.ndarray:
+        """
+        Get the latest distinct months of a view as integer month codes, newest first.
+
+        Args:
+            client: PostgREST client
+            table_name: Name of the view
+            count: Number of months
+
+        Returns:
+            int64 array of month codes
+        """
+        entry = await self._refresh(client, table_name)
+        return entry.months[:count].copy()
+
+    async def get_locations(
+        self,
+        client: AsyncPostgrestClient,
+        table_name: str,
+        location_type: str
+    ) -> List[str]:
+        """
+        Get the distinct location names of a type, sorted by name.
+
+        Args:
+            client: PostgREST client
+            table_name: Name of the view
+            location_type: Type of location
+
+        Returns:
+            List of location names
+        """
+        entry = await self._refresh(client, table_name)
+        names = entry.locations.get(location_type)
+        if names is None:
+            rows = await self._call(client, "get_distinct_locations", {
+                "table_name": table_name,
+                "loc_type": location_type
+            })
+            names = [row["location_name"] for row in rows]
+            entry.locations[location_type] = names
+        return list(names)
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached catalog entries so they reload on next use.
+
+        Args:
+            table_name: View to drop, or None to drop all views
+        """
+        if table_name is None:
+            self._views.clear()
+        else:
+            self._views.pop(table_name, None)
+
+
+# Process-wide month catalog shared by all database clients
+month_catalog = MonthCatalog()
@@ -0,0 +1,111 @@
+"""
+Month encoding module.
+Converts between YYYY_MM strings and integer month codes used throughout the data path.
+
+A month code is ``year * 12 + (month - 1)``, so consecutive months are
+consecutive integers and year-ago, trailing-window and range arithmetic are
+plain integer operations. Strings are produced only at the response and
+query boundary.
+"""
+
+from typing import List, Sequence, Union
+import numpy as np
+
+# Months per year, i.e. the year-over-year lag in month codes
+MONTHS_PER_YEAR = 12
+
+
+def month_code(year_month: str) -> int:
+    """
+    Encode a YYYY_MM month string as an integer month code.
+
+    Args:
+        year_month: Month in YYYY_MM format
+
+    Returns:
+        Integer month code
+    """
+    year, month = year_month.split("_")
+    return int(year) * MONTHS_PER_YEAR + int(month) - 1
+
+
+def month_label(code: int) -> str:
+    """
+    Decode an integer month code to a YYYY_MM month string.
+
+    Args:
+        code: Integer month code
+
+    Returns:
+        Month in YYYY_MM format
+    """
+    year, month = divmod(int(code), MONTHS_PER_YEAR)
+    return f"{year}_{month + 1:02d}"
+
+
+def month_codes(year_months: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """
+    Encode many YYYY_MM strings at once.
+
+    Each distinct string is parsed only once, which keeps bulk-loaded columns
+    (a few hundred distinct months over many rows) cheap to convert.
+
+    Args:
+        year_months: Sequence or array of YYYY_MM strings
+
+    Returns:
+        int64 array of month codes
+    """
+    if len(year_months) == 0:
+        return np.empty(0, dtype=np.int64)
+    unique, inverse = np.unique(np.asarray(year_months, dtype=object), return_inverse=True)
+    return np.array([month_code(value) for value in unique], dtype=np.int64)[inverse]
+
+
+def month_labels(codes: Union[Sequence[int], np.ndarray]) -> List[str]:
+    """
+    Decode many month codes to YYYY_MM strings.
+
+    Args:
+        codes: Sequence or array of month codes
+
+    Returns:
+        List of months in YYYY_MM format
+    """
+    return [month_label(code) for code in codes]
+
+
+def shift_month(year_month: str, offset: int) -> str:
+    """
+    Shift a YYYY_MM month string by a number of months.
+
+    Args:
+        year_month: Month in YYYY_MM format
+        offset: Number of months to shift (negative for earlier months)
+
+    Returns:
+        Shifted month in YYYY_MM format
+    """
+    return month_label(month_code(year_month) + offset)
+
+
+def parse_month(value: str) -> int:
+    """
+    Parse a user-supplied month (YYYY_MM or YYYY-MM) into a month code.
+
+    Args:
+        value: Month string
+
+    Returns:
+        Integer month code
+
+    Raises:
+        ValueError: If the value is not a valid month
+    """
+    parts = value.strip().replace("-", "_").split("_")
+    if len(parts) != 2 or not all(part.isdigit() for part in parts):
+        raise ValueError(f"Invalid month '{value}', expected YYYY_MM")
+    year, month = int(parts[0]), int(parts[1])
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month '{value}', expected YYYY_MM")
+    return year * MONTHS_PER_YEAR + month - 1
@@ -0,0 +1,77 @@
+"""
+Ranking module.
+Provides precomputed rank orderings for summary endpoints.
+"""
+
+import logging
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class RankIndex:
+    """
+    Rank ordering of one metric over the locations of one type.
+
+    Built once per data version; top/bottom slices are O(K) and rank lookups
+    are O(1).
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], score_key: str = "yoy_change"):
+        """
+        Build the index from summary rows.
+
+        Args:
+            items: Summary rows, each carrying ``location_name`` and the score
+            score_key: Key of the ranking score (higher ranks first)
+        """
+        scores = np.array([item[score_key] for item in items], dtype=np.float64)
+        names = np.array([item["location_name"] for item in items], dtype=object)
+
+        # Ties break on location name in both directions, matching the SQL ranking
+        by_name = np.argsort(names, kind="stable")
+        descending = by_name[np.argsort(-scores[by_name], kind="stable")]
+        ascending = by_name[np.argsort(scores[by_name], kind="stable")]
+
+        self.score_key = score_key
+        self.items = [items[i] for i in descending]
+        self.bottom_items = [items[i] for i in ascending]
+        self.ranks = {items[i]["location_name"]: rank for rank, i in enumerate(descending, start=1)}
+
+    def __len__(self) -> int:
+        """Number of ranked locations."""
+        return len(self.items)
+
+    def top(self, count: int, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get ``count`` locations from the top of the ranking, skipping ``offset``."""
+        return self.items[offset:offset + count]
+
+    def bottom(self, count: int, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get ``count`` locations from the bottom of the ranking (lowest first), skipping ``offset``."""
+        return self.bottom_items[offset:offset + count]
+
+    def rank(self, location_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the rank of a location.
+
+        Args:
+            location_name: Name of location
+
+        Returns:
+            Dictionary with rank (1 = highest), total, percentile and the
+            location's summary row, or None if the location is not ranked
+        """
+        rank = self.ranks.get(location_name)
+        if rank is None:
+            return None
+        total = len(self.items)
+        return {
+            "location_name": location_name,
+            "rank": rank,
+            "total": total,
+            "percentile": (total - rank) / (total - 1) * 100 if total > 1 else 100.0,
+            self.score_key: self.items[rank - 1][self.score_key],
+            "summary": self.items[rank - 1]
+        }
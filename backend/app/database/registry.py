@@ -0,0 +1,123 @@
+"""
+Client registry module.
+Provides one pooled PostgREST client per Supabase project, shared by every database client.
+"""
+
+import os
+import logging
+import importlib.util
+from typing import Dict, Tuple, Union
+import httpx
+from postgrest import AsyncPostgrestClient
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client backed by a tuned, long-lived HTTP connection pool."""
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        headers: Dict[str, str],
+        limits: httpx.Limits,
+        http2: bool,
+        timeout: Union[int, float, httpx.Timeout]
+    ):
+        """
+        Initialize pooled client.
+
+        Args:
+            base_url: PostgREST endpoint URL
+            headers: Default request headers
+            limits: Connection pool limits
+            http2: Whether to negotiate HTTP/2
+            timeout: Request timeout
+        """
+        # create_session() runs inside the parent constructor, so pool settings go first
+        self.limits = limits
+        self.http2 = http2
+        super().__init__(base_url, headers=headers, timeout=timeout)
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, httpx.Timeout]
+    ) -> httpx.AsyncClient:
+        """Create the shared HTTP session with pooling, keep-alive and optional HTTP/2."""
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=self.limits,
+            http2=self.http2
+        )
+
+
+class ClientRegistry:
+    """Process-wide registry of pooled PostgREST clients keyed by Supabase URL and key."""
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._clients: Dict[Tuple[str, str], PooledPostgrestClient] = {}
+
+    def get_client(self, url: str, key: str) -> PooledPostgrestClient:
+        """
+        Get the shared client for a Supabase project, creating it on first use.
+
+        Args:
+            url: Supabase project URL
+            key: Supabase API key
+
+        Returns:
+            Shared pooled PostgREST client
+        """
+        client = self._clients.get((url, key))
+        if client is None:
+            client = self._create_client(url, key)
+            self._clients[(url, key)] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client and release its connections."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    def _create_client(self, url: str, key: str) -> PooledPostgrestClient:
+        """Create a pooled client using the connection settings from the environment."""
+        max_connections = int(os.getenv("SUPABASE_POOL_SIZE", "20"))
+        max_keepalive = int(os.getenv("SUPABASE_POOL_KEEPALIVE", "10"))
+        keepalive_expiry = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "60"))
+        timeout = float(os.getenv("SUPABASE_TIMEOUT", "30"))
+        http2 = os.getenv("SUPABASE_HTTP2", "True").lower() == "true"
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed. Using HTTP/1.1.")
+            http2 = False
+
+        logger.info(
+            f"Creating pooled PostgREST client: pool={max_connections}, "
+            f"keepalive={max_keepalive}/{keepalive_expiry}s, http2={http2}"
+        )
+        return PooledPostgrestClient(
+            f"{url}/rest/v1",
+            headers={
+                "apiKey": key,
+                "Authorization": f"Bearer {key}"
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry
+            ),
+            http2=http2,
+            timeout=timeout
+        )
+
+
+# Process-wide client registry shared by all database clients
+client_registry = ClientRegistry()
@@ -0,0 +1,525 @@
+"""
+Snapshot store module.
+Keeps process-wide, in-memory columnar copies of the Apartment List views.
+"""
+
+import logging
+import asyncio
+import time
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from postgrest import AsyncPostgrestClient
+from .bulk_loader import BulkLoader, ColumnarBuffer
+from .data_version import data_version_monitor
+from .forecast import ForecastResult, precompute_forecasts
+from .months import MONTHS_PER_YEAR, month_codes, month_labels
+from .ranking import RankIndex
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ViewSnapshot:
+    """
+    Columnar in-memory copy of one Apartment List view.
+
+    Values are stored as float64 matrices of shape (locations, months) with NaN
+    for missing values. The month axis is a dense run of integer month codes,
+    so the column of a month is ``code - first_month`` and position ``i - 12``
+    is always the same month one year earlier.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        months: np.ndarray,
+        locations: List[Tuple[str, str]],
+        values: Dict[str, np.ndarray],
+        present: np.ndarray
+    ):
+        """
+        Initialize snapshot.
+
+        Args:
+            table_name: Name of the source view
+            months: Dense ascending array of integer month codes
+            locations: List of (location_type, location_name) pairs, one per matrix row
+            values: Mapping of value column to (locations, months) matrix
+            present: Boolean (locations, months) matrix marking rows present in the view
+        """
+        self.table_name = table_name
+        self.month_codes = np.asarray(months, dtype=np.int64)
+        self.first_month = int(self.month_codes[0]) if len(self.month_codes) else 0
+        # YYYY_MM labels, only used when building responses
+        self.months = month_labels(self.month_codes)
+        self.locations = locations
+        self.location_index = {location: i for i, location in enumerate(locations)}
+        self.values = values
+        self.present = present
+        # Per-column forecasts, fitted in the background once the snapshot is
+        # published; ready once fitting finished (even if it failed)
+        self.forecasts: Dict[str, ForecastResult] = {}
+        self.forecasts_ready = False
+        # Change prefix sums per (column, lag) and rank orderings, built on first use
+        self._prefix_sums: Dict[Tuple[str, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self._ranks: Dict[Tuple[str, str, int, int, int], RankIndex] = {}
+
+        # Row indices per location type, ordered by location name
+        self.type_rows: Dict[str, np.ndarray] = {}
+        for i, (location_type, _) in enumerate(locations):
+            self.type_rows.setdefault(location_type, []).append(i)
+        self.type_rows = {
+            location_type: np.asarray(rows, dtype=np.intp)
+            for location_type, rows in self.type_rows.items()
+        }
+
+        # Months that carry at least one row, used for "latest month" lookups
+        self.populated_codes = self.month_codes[present.any(axis=0)] if present.size else self.month_codes
+
+    @classmethod
+    def from_columns(
+        cls,
+        table_name: str,
+        buffer: ColumnarBuffer,
+        value_columns: List[str]
+    ) -> "ViewSnapshot":
+        """
+        Build a snapshot from bulk-loaded view columns.
+
+        Args:
+            table_name: Name of the source view
+            buffer: Columns location_type, location_name, year_month and value columns
+            value_columns: Numeric columns to keep
+
+        Returns:
+            Populated snapshot
+        """
+        if len(buffer) == 0:
+            return cls(table_name, np.empty(0, dtype=np.int64), [], {
+                column: np.empty((0, 0)) for column in value_columns
+            }, np.zeros((0, 0), dtype=bool))
+
+        # Encode months as integer codes; the dense month axis starts at the earliest one
+        codes = month_codes(buffer["year_month"])
+        first_month = int(codes.min())
+        months = np.arange(first_month, int(codes.max()) + 1, dtype=np.int64)
+        col_idx = codes - first_month
+
+        # Factorize (location_type, location_name) pairs in sorted order
+        location_keys = buffer["location_type"] + "\x1f" + buffer["location_name"]
+        unique_keys, row_idx = np.unique(location_keys, return_inverse=True)
+        locations = [tuple(key.split("\x1f", 1)) for key in unique_keys]
+
+        shape = (len(locations), len(months))
+        values = {column: np.full(shape, np.nan) for column in value_columns}
+        present = np.zeros(shape, dtype=bool)
+        present[row_idx, col_idx] = True
+        for column in value_columns:
+            values[column][row_idx, col_idx] = buffer[column]
+
+        return cls(table_name, months, locations, values, present)
+
+    def month_position(self, code: int) -> Optional[int]:
+        """Get the column of a month code, or None if it is outside the snapshot."""
+        position = int(code) - self.first_month
+        if 0 <= position < len(self.month_codes):
+            return position
+        return None
+
+    def latest_month_codes(self, count: int = 3) -> np.ndarray:
+        """Get the latest populated month codes, newest first."""
+        return self.populated_codes[::-1][:count]
+
+    def latest_months(self, count: int = 3) -> List[str]:
+        """Get the latest populated months in YYYY_MM format, newest first."""
+        return month_labels(self.latest_month_codes(count))
+
+    def location_names(self, location_type: str) -> List[str]:
+        """Get sorted location names for a location type."""
+        rows = self.type_rows.get(location_type)
+        if rows is None:
+            return []
+        return [self.locations[i][1] for i in rows]
+
+    def location_rows(self, location_type: str, location_name: str) -> List[Dict[str, Any]]:
+        """
+        Get the view rows of one location, ordered by year_month.
+
+        Args:
+            location_type: Type of location
+            location_name: Name of location
+
+        Returns:
+            List of row dictionaries shaped like the view rows
+        """
+        i = self.location_index.get((location_type, location_name))
+        if i is None:
+            return []
+
+        rows = []
+        for j in np.flatnonzero(self.present[i]):
+            row = {
+                "location_type": location_type,
+                "location_name": location_name,
+                "year_month": self.months[j]
+            }
+            for column, matrix in self.values.items():
+                value = matrix[i, j]
+                row[column] = None if np.isnan(value) else float(value)
+            rows.append(row)
+        return rows
+
+    def change_prefix_sums(self, column: str, lag: int = MONTHS_PER_YEAR) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get prefix sums of percent changes against the value ``lag`` months earlier.
+
+        Built once per (column, lag) and snapshot. A change is valid when both
+        values exist and the earlier one is positive. Column ``j + 1`` of each
+        array covers months ``0..j``, so any trailing window is two lookups.
+
+        Args:
+            column: Value column
+            lag: Months between compared values (12 for YoY, 1 for MoM)
+
+        Returns:
+            Tuple of (sums, counts), each of shape (locations, months + 1)
+        """
+        key = (column, lag)
+        cached = self._prefix_sums.get(key)
+        if cached is not None:
+            return cached
+
+        matrix = self.values[column]
+        changes = np.full(matrix.shape, np.nan)
+        if matrix.shape[1] > lag:
+            current = matrix[:, lag:]
+            prior = matrix[:, :-lag]
+            valid = ~np.isnan(current) & ~np.isnan(prior) & (prior > 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                changes[:, lag:] = np.where(valid, (current - prior) / prior * 100, np.nan)
+        valid = ~np.isnan(changes)
+
+        sums = np.zeros((matrix.shape[0], matrix.shape[1] + 1))
+        counts = np.zeros((matrix.shape[0], matrix.shape[1] + 1), dtype=np.int64)
+        np.cumsum(np.where(valid, changes, 0.0), axis=1, out=sums[:, 1:])
+        np.cumsum(valid, axis=1, out=counts[:, 1:])
+        self._prefix_sums[key] = (sums, counts)
+        return sums, counts
+
+    def summary_rows(
+        self,
+        location_type: str,
+        column: str,
+        prefix: str,
+        month_count: int = 3,
+        window: Optional[int] = None,
+        lag: int = MONTHS_PER_YEAR
+    ) -> List[Dict[str, Any]]:
+        """
+        Build summary rows with a trailing average percent change.
+
+        The change of each month in the trailing ``window`` months is taken
+        against the month ``lag`` months earlier; invalid pairs (missing or
+        non-positive base) are skipped and the remaining changes are averaged
+        using the prefix sums, so any window costs O(1) per location.
+        Locations without any valid pair are left out.
+
+        Args:
+            location_type: Type of location
+            column: Value column to summarize
+            prefix: Key prefix for monthly values (e.g. 'rent_estimate')
+            month_count: Number of latest monthly values to include
+            window: Trailing months averaged (defaults to ``month_count``)
+            lag: Months between compared values (12 for YoY, 1 for MoM)
+
+        Returns:
+            List of summary dictionaries shaped like the summary views
+        """
+        window = window or month_count
+        rows = self.type_rows.get(location_type)
+        latest = self.latest_month_codes(month_count)
+        if rows is None or not len(latest):
+            return []
+
+        # Trailing window ending at the latest populated month
+        end = int(latest[0]) - self.first_month + 1
+        start = max(end - window, 0)
+        sums, counts = self.change_prefix_sums(column, lag)
+        valid_count = counts[rows, end] - counts[rows, start]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = (sums[rows, end] - sums[rows, start]) / valid_count
+
+        current = self.values[column][rows][:, latest - self.first_month]
+        labels = month_labels(latest)
+        result = []
+        for k in np.flatnonzero(valid_count > 0):
+            row = {
+                "location_type": location_type,
+                "location_name": self.locations[rows[k]][1]
+            }
+            for n, month in enumerate(labels, start=1):
+                value = current[k, n - 1]
+                row[f"month{n}_year_month"] = month
+                row[f"month{n}_{prefix}"] = None if np.isnan(value) else float(value)
+            row["yoy_change"] = float(change[k])
+            result.append(row)
+        return result
+
+    def rank_index(
+        self,
+        location_type: str,
+        column: str,
+        prefix: str,
+        month_count: int = 3,
+        window: Optional[int] = None,
+        lag: int = MONTHS_PER_YEAR
+    ) -> RankIndex:
+        """
+        Get the trailing-change rank ordering of a location type, building it once per snapshot.
+
+        Args:
+            location_type: Type of location
+            column: Value column to rank
+            prefix: Key prefix for monthly values in the summary rows
+            month_count: Number of latest monthly values in the summary rows
+            window: Trailing months averaged (defaults to ``month_count``)
+            lag: Months between compared values (12 for YoY, 1 for MoM)
+
+        Returns:
+            Rank index over the summary rows of the location type
+        """
+        window = window or month_count
+        key = (location_type, column, month_count, window, lag)
+        index = self._ranks.get(key)
+        if index is None:
+            index = RankIndex(self.summary_rows(location_type, column, prefix, month_count, window, lag))
+            self._ranks[key] = index
+        return index
+
+
+class SnapshotStore:
+    """Process-wide registry of view snapshots, loaded once per view."""
+
+    def __init__(self):
+        """Initialize empty store."""
+        self._snapshots: Dict[str, ViewSnapshot] = {}
+        # Data version and time each held snapshot was published
+        self._versions: Dict[str, Optional[str]] = {}
+        self._published_at: Dict[str, Optional[float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._warming: Dict[str, asyncio.Task] = {}
+        self._reloading: Dict[str, asyncio.Task] = {}
+        self._forecasting: Dict[str, asyncio.Task] = {}
+        self._sources: Dict[str, Tuple[AsyncPostgrestClient, List[str]]] = {}
+
+    async def get(
+        self,
+        client: AsyncPostgrestClient,
+        table_name: str,
+        value_columns: List[str]
+    ) -> ViewSnapshot:
+        """
+        Get the snapshot of a view, loading it on first use.
+
+        Args:
+            client: PostgREST client used for the initial load
+            table_name: Name of the view
+            value_columns: Numeric columns to keep
+
+        Returns:
+            Snapshot of the view
+        """
+        snapshot = self._snapshots.get(table_name)
+        if snapshot is not None:
+            return snapshot
+        self._sources[table_name] = (client, list(value_columns))
+
+        # One lock per view: concurrent first requests share a single load,
+        # while different views still load in parallel
+        lock = self._locks.setdefault(table_name, asyncio.Lock())
+        async with lock:
+            snapshot = self._snapshots.get(table_name)
+            if snapshot is None:
+                version = await data_version_monitor.get_version(client, table_name)
+                snapshot = await self._load(client, table_name, value_columns)
+                self._publish(table_name, snapshot, version, data_version_monitor.peek_changed_at(table_name))
+                current = data_version_monitor.peek_version(table_name)
+                if version is not None and current != version:
+                    # The data changed while loading: rebuild in the background
+                    self.on_version_change(table_name, current)
+        return snapshot
+
+    def peek(self, table_name: str) -> Optional[ViewSnapshot]:
+        """Get the snapshot of a view only if it is already loaded."""
+        return self._snapshots.get(table_name)
+
+    def peek_version(self, table_name: str) -> Optional[str]:
+        """Get the data version of the snapshot being served, if loaded and known."""
+        return self._versions.get(table_name)
+
+    def peek_published_at(self, table_name: str) -> Optional[float]:
+        """Get the UNIX time at which the snapshot being served took effect, if loaded and known."""
+        return self._published_at.get(table_name)
+
+    def _publish(
+        self,
+        table_name: str,
+        snapshot: ViewSnapshot,
+        version: Optional[str],
+        published_at: Optional[float]
+    ) -> None:
+        """Make a snapshot the one served for a view and start fitting its forecasts."""
+        self._snapshots[table_name] = snapshot
+        self._versions[table_name] = version
+        self._published_at[table_name] = published_at
+
+        running = self._forecasting.get(table_name)
+        if running is not None and not running.done():
+            running.cancel()
+        self._forecasting[table_name] = asyncio.create_task(self._fit_forecasts(snapshot))
+
+    def forecasts_pending(self, table_name: str) -> bool:
+        """Check whether the snapshot being served for a view is still fitting its forecasts."""
+        snapshot = self._snapshots.get(table_name)
+        return snapshot is not None and not snapshot.forecasts_ready
+
+    async def _fit_forecasts(self, snapshot: ViewSnapshot) -> None:
+        """Batch-fit the forecasts of a published snapshot in the process pool."""
+        try:
+            snapshot.forecasts = await precompute_forecasts(snapshot)
+        except asyncio.CancelledError:
+            if self._snapshots.get(snapshot.table_name) is not snapshot:
+                # Superseded by a newer snapshot in _publish: nothing left to serve
+                raise
+            logger.warning(f"Forecast fitting of {snapshot.table_name} cancelled, serving without forecasts")
+            self._finish_forecasts(snapshot)
+            raise
+        except Exception as e:
+            logger.error(f"Error fitting forecasts of {snapshot.table_name}: {str(e)}")
+        self._finish_forecasts(snapshot)
+
+    def _finish_forecasts(self, snapshot: ViewSnapshot) -> None:
+        """Mark a snapshot's forecast fitting as finished."""
+        snapshot.forecasts_ready = True
+        if self._snapshots.get(snapshot.table_name) is snapshot:
+            # Detail responses gain their forecasts now
+            self._published_at[snapshot.table_name] = time.time()
+
+    def warm(
+        self,
+        client: AsyncPostgrestClient,
+        table_name: str,
+        value_columns: List[str]
+    ) -> None:
+        """
+        Start loading a view in the background unless it is loaded or loading.
+
+        Args:
+            client: PostgREST client used for the load
+            table_name: Name of the view
+            value_columns: Numeric columns to keep
+        """
+        if table_name in self._snapshots:
+            return
+        task = self._warming.get(table_name)
+        if task is not None and not task.done():
+            return
+
+        async def load() -> None:
+            try:
+                await self.get(client, table_name, value_columns)
+            except Exception as e:
+                logger.error(f"Error warming snapshot of {table_name}: {str(e)}")
+
+        self._warming[table_name] = asyncio.create_task(load())
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached snapshots so they reload on next use.
+
+        Args:
+            table_name: View to drop, or None to drop all views
+        """
+        if table_name is None:
+            self._snapshots.clear()
+            self._versions.clear()
+            self._published_at.clear()
+        else:
+            self._snapshots.pop(table_name, None)
+            self._versions.pop(table_name, None)
+            self._published_at.pop(table_name, None)
+
+    def on_version_change(self, table_name: str, version: str) -> None:
+        """
+        Rebuild the snapshot of a view whose data changed in the background.
+
+        The current snapshot keeps serving requests until its replacement is
+        built, then the two are swapped in one step. A reload still running
+        for an earlier version is abandoned.
+
+        Args:
+            table_name: Name of the view
+            version: New data version
+        """
+        source = self._sources.get(table_name)
+        if source is None or table_name not in self._snapshots:
+            # Nothing served yet: the next request loads the new data
+            self.invalidate(table_name)
+            return
+
+        running = self._reloading.get(table_name)
+        if running is not None and not running.done():
+            running.cancel()
+        logger.info(f"Reloading snapshot of {table_name} for data version {version}")
+        self._reloading[table_name] = asyncio.create_task(
+            self._reload(source[0], table_name, source[1], version)
+        )
+
+    async def _reload(
+        self,
+        client: AsyncPostgrestClient,
+        table_name: str,
+        value_columns: List[str],
+        version: str
+    ) -> None:
+        """Build a new snapshot of a view and swap it in once complete."""
+        try:
+            snapshot = await self._load(client, table_name, value_columns)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error reloading snapshot of {table_name}, keeping previous one: {str(e)}")
+            return
+
+        lock = self._locks.setdefault(table_name, asyncio.Lock())
+        async with lock:
+            self._publish(table_name, snapshot, version, time.time())
+        logger.info(f"Swapped in snapshot of {table_name} for data version {version}")
+
+    async def _load(
+        self,
+        client: AsyncPostgrestClient,
+        table_name: str,
+        value_columns: List[str]
+    ) -> ViewSnapshot:
+        """Bulk-load a whole view and build its snapshot."""
+        buffer = await BulkLoader(client).load(
+            table_name,
+            ["location_type", "location_name", "year_month", *value_columns],
+            numeric_columns=value_columns,
+            order_by=["location_type", "location_name", "year_month"]
+        )
+
+        started = time.perf_counter()
+        snapshot = ViewSnapshot.from_columns(table_name, buffer, value_columns)
+        logger.info(
+            f"Built snapshot of {table_name}: {len(snapshot.locations)} locations x "
+            f"{len(snapshot.months)} months from {len(buffer)} rows "
+            f"(load {buffer.stats['seconds']:.2f}s, build {time.perf_counter() - started:.2f}s)"
+        )
+        return snapshot
+
+
+# Process-wide snapshot store shared by all database clients
+snapshot_store = SnapshotStore()
+data_version_monitor.subscribe(snapshot_store.on_version_change)
@@ -0,0 +1,304 @@
+"""
+Time series module.
+Builds metric-agnostic, JSON-ready time series with year-over-year changes from view snapshots.
+"""
+
+import logging
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+import numpy as np
+from .forecast import forecast_series
+from .months import MONTHS_PER_YEAR
+from .snapshot import ViewSnapshot
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Months between a value and its year-ago comparison on a dense month axis
+YOY_LAG = MONTHS_PER_YEAR
+
+
+def yoy_change(values: np.ndarray, lag: int = YOY_LAG) -> np.ndarray:
+    """
+    Compute percent changes against the value ``lag`` months earlier.
+
+    Works on 1-D series or 2-D (locations, months) matrices; the last axis
+    must be a dense month axis. Positions without a current value, without
+    a prior value, or with a prior value of zero are NaN.
+
+    Args:
+        values: float64 array with NaN for missing values
+        lag: Number of months to shift
+
+    Returns:
+        float64 array of percent changes, same shape as ``values``
+    """
+    changes = np.full(values.shape, np.nan)
+    if values.shape[-1] <= lag:
+        return changes
+
+    current = values[..., lag:]
+    prior = values[..., :-lag]
+    valid = ~np.isnan(current) & ~np.isnan(prior) & (prior != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        changes[..., lag:] = np.where(valid, (current - prior) / prior * 100, np.nan)
+    return changes
+
+
+def to_json_list(values: np.ndarray, fill: Optional[float] = None) -> List[Optional[float]]:
+    """
+    Convert a float array to a JSON-ready list, mapping NaN to ``fill``.
+
+    Args:
+        values: 1-D float64 array
+        fill: Replacement for NaN entries
+
+    Returns:
+        List of Python floats
+    """
+    return [fill if value != value else value for value in values.tolist()]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the average of the next bucket.
+
+    Args:
+        x: Ascending x positions
+        y: Values at ``x`` (no NaN)
+        threshold: Number of points to keep
+
+    Returns:
+        Ascending indices of the selected points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    edges = (np.floor(np.arange(threshold - 1) * every) + 1).astype(np.intp)
+    edges[-1] = n - 1
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_start = end if bucket + 2 < len(edges) else n - 1
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def build_time_series(
+    snapshot: ViewSnapshot,
+    location_type: str,
+    location_name: str,
+    series: Dict[str, str],
+    missing_yoy: Optional[float] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    max_points: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Build the detail time series of one location for any set of metric columns.
+
+    Only months present in the view are returned, oldest first. YoY changes
+    are computed on the full history before the optional month-code range is
+    sliced out, and ``max_points`` downsamples all series to the same months
+    chosen by LTTB on the first series. Precomputed forecasts of the location
+    are attached under ``forecast``; while the snapshot's forecasts are still
+    being fitted, ``forecast_pending`` is set instead.
+
+    Args:
+        snapshot: Snapshot of the view
+        location_type: Type of location
+        location_name: Name of location
+        series: Mapping of output key to value column
+        missing_yoy: YoY reported when a value exists but has no usable year-ago value
+        start: First month code to include
+        end: Last month code to include
+        max_points: Maximum number of months to return
+
+    Returns:
+        Dictionary with ``dates``, one ``{values, yoy_changes}`` entry per
+        output key and an optional ``forecast`` block (or ``forecast_pending``),
+        or an empty dictionary if the location is unknown
+    """
+    i = snapshot.location_index.get((location_type, location_name))
+    if i is None:
+        return {}
+
+    present = np.flatnonzero(snapshot.present[i])
+    if present.size == 0:
+        return {}
+
+    # Month-code range as a binary search on the dense month axis
+    if start is not None or end is not None:
+        low = np.searchsorted(present, start - snapshot.first_month) if start is not None else 0
+        high = np.searchsorted(present, end - snapshot.first_month, side="right") if end is not None else len(present)
+        present = present[low:high]
+
+    if max_points is not None and len(present) > max_points:
+        primary = snapshot.values[next(iter(series.values()))][i][present]
+        valid = np.flatnonzero(~np.isnan(primary))
+        if len(valid) > max_points:
+            present = present[valid[lttb_indices(present[valid].astype(np.float64), primary[valid], max_points)]]
+        elif len(valid) >= 3:
+            # Few enough primary values: keep the months that have one
+            present = present[valid]
+        else:
+            # Too few primary values to downsample on: keep evenly spaced months
+            present = present[np.linspace(0, len(present) - 1, max_points).round().astype(np.intp)]
+
+    result: Dict[str, Any] = {"dates": [snapshot.months[j] for j in present]}
+    for key, column in series.items():
+        values = snapshot.values[column][i]
+        changes = yoy_change(values)[present]
+        values = values[present]
+        if missing_yoy is not None:
+            changes = np.where(np.isnan(changes) & ~np.isnan(values), missing_yoy, changes)
+        result[key] = {
+            "values": to_json_list(values),
+            "yoy_changes": to_json_list(changes)
+        }
+
+    if not snapshot.forecasts_ready:
+        result["forecast_pending"] = True
+        return result
+
+    forecast = forecast_series(snapshot.forecasts, i, series)
+    if forecast is not None:
+        result["forecast"] = forecast
+    return result
+
+
+def rolling_mean_std(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute trailing rolling mean and sample standard deviation in O(n).
+
+    Uses cumulative sums of the values and their squares (centered on the
+    series mean for numerical stability). A window yields NaN unless all of
+    its months have values.
+
+    Args:
+        values: 1-D float64 series on a dense month axis, NaN for missing
+        window: Number of months per window
+
+    Returns:
+        Tuple of (mean, std) arrays, same length as ``values``
+    """
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    valid = ~np.isnan(values)
+    if window < 1 or len(values) < window or not valid.any():
+        return mean, std
+
+    center = values[valid].mean()
+    filled = np.where(valid, values - center, 0.0)
+    sums = np.concatenate([[0.0], np.cumsum(filled)])
+    squares = np.concatenate([[0.0], np.cumsum(filled ** 2)])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+
+    window_sum = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    full = (counts[window:] - counts[:-window]) == window
+
+    window_mean = window_sum / window
+    mean[window - 1:] = np.where(full, window_mean + center, np.nan)
+    if window > 1:
+        variance = (window_squares - window * window_mean ** 2) / (window - 1)
+        std[window - 1:] = np.where(full, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+    else:
+        std[window - 1:] = np.where(full, 0.0, np.nan)
+    return mean, std
+
+
+def drawdown(values: np.ndarray) -> Tuple[np.ndarray, Optional[int], Optional[int]]:
+    """
+    Compute the percent drawdown from the running peak in O(n).
+
+    Args:
+        values: 1-D float64 series, NaN for missing
+
+    Returns:
+        Tuple of (drawdown array in percent, peak position, trough position) where
+        the positions delimit the maximum drawdown, or None if there is none
+    """
+    peaks = np.fmax.accumulate(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = np.where(peaks > 0, (values / peaks - 1) * 100, np.nan)
+    if np.isnan(drawdowns).all() or np.nanmin(drawdowns) >= 0:
+        return drawdowns, None, None
+
+    trough = int(np.nanargmin(drawdowns))
+    peak = int(np.flatnonzero(values[:trough + 1] == peaks[trough])[-1])
+    return drawdowns, peak, trough
+
+
+def build_rolling_stats(
+    snapshot: ViewSnapshot,
+    location_type: str,
+    location_name: str,
+    series: Dict[str, str],
+    windows: Sequence[int]
+) -> Dict[str, Any]:
+    """
+    Build rolling statistics of one location for any set of metric columns.
+
+    Statistics are computed on the dense month axis and reported for the
+    months present in the view, oldest first.
+
+    Args:
+        snapshot: Snapshot of the view
+        location_type: Type of location
+        location_name: Name of location
+        series: Mapping of output key to value column
+        windows: Rolling window lengths in months
+
+    Returns:
+        Dictionary with ``dates`` and, per output key, rolling mean/std per
+        window, the drawdown series and the maximum drawdown, or an empty
+        dictionary if the location is unknown
+    """
+    i = snapshot.location_index.get((location_type, location_name))
+    if i is None:
+        return {}
+
+    present = np.flatnonzero(snapshot.present[i])
+    if present.size == 0:
+        return {}
+
+    result: Dict[str, Any] = {"dates": [snapshot.months[j] for j in present]}
+    for key, column in series.items():
+        values = snapshot.values[column][i]
+        rolling = {}
+        for window in windows:
+            mean, std = rolling_mean_std(values, window)
+            rolling[str(window)] = {
+                "mean": to_json_list(mean[present]),
+                "std": to_json_list(std[present])
+            }
+
+        drawdowns, peak, trough = drawdown(values)
+        result[key] = {
+            "rolling": rolling,
+            "drawdown": to_json_list(drawdowns[present]),
+            "max_drawdown": {
+                "value": float(drawdowns[trough]),
+                "peak_date": snapshot.months[peak],
+                "trough_date": snapshot.months[trough]
+            } if trough is not None else None
+        }
+    return result
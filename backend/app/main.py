@@ -8,6 +8,7 @@ import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from .core.responses import ORJSONResponse
 
 # Configure logging
 logging.basicConfig(
@@ -19,9 +20,45 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Real Estate Analytics API",
     description="API for real estate rent analytics data",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Import routers
+from .api.apartmentlist.vacancy_rev_routes import router as vacancy_rev_router
+from .api.apartmentlist.rent_rev_routes import router as rent_rev_router
+from .api.apartmentlist.time_on_market_routes import router as time_on_market_router
+from .api.apartmentlist.dashboard_routes import router as dashboard_router
+from .api.rentcast.rent_estimates.routes import router as rent_estimates_router
+from .api.rentcast.rent_estimates.routes import cache_manager as rent_estimates_cache
+from .database.registry import client_registry
+from .services.rentcast.http_client import rentcast_http
+from .database.data_version import data_version_monitor
+from .database.forecast import shutdown_executor
+from .database.apartmentlist.rent_rev_db import RentRevDBClient
+from .database.apartmentlist.vacancy_rev_db import VacancyRevDBClient
+from .database.apartmentlist.time_on_market_db import TimeOnMarketDBClient
+from .core.http_cache import ConditionalResponseMiddleware
+from .core.compression import CompressionMiddleware
+from .core.single_flight import single_flight
+
+# Conditional GETs keyed on the data version of each view (inside CORS so 304s keep CORS headers)
+rent_rev_view = RentRevDBClient().table_name
+vacancy_rev_view = VacancyRevDBClient().table_name
+time_on_market_view = TimeOnMarketDBClient().table_name
+app.add_middleware(
+    ConditionalResponseMiddleware,
+    views={
+        f"/api{rent_rev_router.prefix}": rent_rev_view,
+        f"/api{vacancy_rev_router.prefix}": vacancy_rev_view,
+        f"/api{time_on_market_router.prefix}": time_on_market_view,
+        f"/api{dashboard_router.prefix}": (rent_rev_view, vacancy_rev_view, time_on_market_view)
+    }
+)
+
+# Compress large bodies (outside the conditional layer, so 304s stay empty)
+app.add_middleware(CompressionMiddleware)
+
 # Configure CORS
 origins = ["*"]  # 临时允许所有源访问，用于测试
 
@@ -33,12 +70,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Import routers
-from .api.apartmentlist.vacancy_rev_routes import router as vacancy_rev_router
-from .api.apartmentlist.rent_rev_routes import router as rent_rev_router
-from .api.apartmentlist.time_on_market_routes import router as time_on_market_router
-from .api.rentcast.rent_estimates.routes import router as rent_estimates_router
-
 # Include routers
 app.include_router(
     vacancy_rev_router,
@@ -52,11 +83,44 @@ app.include_router(
     time_on_market_router,
     prefix="/api"
 )
+app.include_router(
+    dashboard_router,
+    prefix="/api"
+)
 app.include_router(
     rent_estimates_router,
     prefix="/api/rentcast"
 )
 
+@app.on_event("startup")
+async def open_rentcast_client():
+    """Open the shared RentCast connection pool."""
+    rentcast_http.get_client()
+
+@app.on_event("startup")
+async def start_data_version_monitor():
+    """Start the background data-version probe."""
+    data_version_monitor.start()
+
+@app.on_event("startup")
+async def precompute_views():
+    """Load the view snapshots in the background; their forecasts are fitted once each is published."""
+    if os.getenv("PRECOMPUTE_ON_STARTUP", "True").lower() != "true":
+        return
+    try:
+        for db_client in (RentRevDBClient(), VacancyRevDBClient(), TimeOnMarketDBClient()):
+            db_client.warm_snapshot()
+    except Exception as e:
+        logger.error(f"Error starting startup precompute: {str(e)}")
+
+@app.on_event("shutdown")
+async def shutdown_clients():
+    """Stop background jobs and close pooled database connections on shutdown."""
+    await data_version_monitor.stop()
+    shutdown_executor()
+    await client_registry.aclose()
+    await rentcast_http.aclose()
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for all unhandled exceptions."""
@@ -69,4 +133,12 @@ async def global_exception_handler(request, exc):
 @app.get("/")
 async def root():
     """Root endpoint for API health check."""
-    return {"status": "ok", "message": "Real Estate Analytics API is running"}
\ No newline at end of file
+    return {"status": "ok", "message": "Real Estate Analytics API is running"}
+
+@app.get("/api/metrics")
+async def metrics():
+    """Runtime metrics of the request coalescing and caching layers."""
+    return {
+        "single_flight": single_flight.stats(),
+        "rent_estimates_cache": rent_estimates_cache.stats()
+    }
@@ -0,0 +1,89 @@
+"""
+Dashboard processor module.
+Assembles the landing-page summaries of every metric and location type in one pass.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Sequence
+from ...core.single_flight import coalesced
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Location types shown on the first-level summary pages
+DASHBOARD_LOCATION_TYPES = ("State", "Metro", "City")
+
+
+class DashboardProcessor:
+    """Processor combining the summaries of several metric processors."""
+
+    def __init__(self, processors: Dict[str, Any]):
+        """
+        Initialize dashboard processor.
+
+        Args:
+            processors: Mapping of metric name to its processor (shared with the
+                metric's own routes so summary caches are shared too)
+        """
+        self.processors = processors
+
+    @coalesced
+    async def get_dashboard(
+        self,
+        location_types: Sequence[str] = DASHBOARD_LOCATION_TYPES,
+        top_n: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the summaries of every metric and location type.
+
+        Summaries of all metrics and location types are gathered
+        concurrently. Each is ranked from its metric's in-memory snapshot when
+        loaded, or by the Postgres ranking function while the snapshot is
+        cold; cold snapshots start loading in the background without being
+        awaited.
+
+        Args:
+            location_types: Location types to summarize
+            top_n: Locations in each of the top and bottom groups (defaults per type)
+
+        Returns:
+            Dictionary with per-metric data versions and latest months, and the
+            summary of every metric and location type
+        """
+        try:
+            metrics = list(self.processors)
+            for processor in self.processors.values():
+                processor.warm_snapshot()
+
+            requests = [(metric, location_type) for metric in metrics for location_type in location_types]
+            summaries = await asyncio.gather(*(
+                self.processors[metric].get_summary_data(location_type, top_n)
+                for metric, location_type in requests
+            ))
+
+            data: Dict[str, Dict[str, Any]] = {metric: {} for metric in metrics}
+            data_versions: Dict[str, Optional[str]] = {}
+            latest_months: Dict[str, Any] = {}
+            for (metric, location_type), summary in zip(requests, summaries):
+                data[metric][location_type] = summary
+                if "error" not in summary:
+                    data_versions.setdefault(metric, summary["metadata"]["data_version"])
+                    latest_months.setdefault(metric, summary["metadata"]["latest_months"])
+
+            if not data_versions:
+                return {"error": "No dashboard data available"}
+
+            return {
+                "metadata": {
+                    "metrics": metrics,
+                    "location_types": list(location_types),
+                    "data_versions": data_versions,
+                    "latest_months": latest_months
+                },
+                "data": data
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing dashboard data: {str(e)}")
+            return {"error": "Failed to process dashboard data"}
@@ -3,6 +3,7 @@ Rent data processing module.
 Handles business logic for apartment rent data.
 """
 
+import asyncio
 from typing import List, Dict, Any, Tuple
 from ...database.apartmentlist.rent_db import RentDBClient
 
@@ -13,15 +14,17 @@ class RentProcessor:
         """Initialize rent data processor."""
         self.db = RentDBClient()
         
-    def get_summary_data(self) -> Dict[str, Any]:
+    async def get_summary_data(self) -> Dict[str, Any]:
         """
         Get summary data for all location types.
         Returns top and bottom locations for states, metros, and cities.
         """
-        # Get data for each location type
-        states_data = self.db.get_location_data("State")
-        metros_data = self.db.get_location_data("Metro")
-        cities_data = self.db.get_location_data("City")
+        # Get data for each location type concurrently
+        states_data, metros_data, cities_data = await asyncio.gather(
+            self.db.get_location_data("State"),
+            self.db.get_location_data("Metro"),
+            self.db.get_location_data("City")
+        )
         
         def split_data(data: List[Dict[str, Any]], top_count: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
             """Split data into top and bottom performers."""
@@ -47,7 +50,7 @@ class RentProcessor:
             }
         }
 
-    def get_location_details(self, location_type: str, location_name: str) -> Dict[str, Any]:
+    async def get_location_details(self, location_type: str, location_name: str) -> Dict[str, Any]:
         """
         Get detailed time series data for a specific location.
         
@@ -58,11 +61,11 @@ class RentProcessor:
         Returns:
             Dictionary containing time series data and metadata
         """
-        time_series = self.db.get_location_time_series(location_type, location_name)
+        time_series = await self.db.get_location_time_series(location_type, location_name)
         
         if not time_series:
             # Try to get basic data
-            locations = self.db.get_location_data(location_type)
+            locations = await self.db.get_location_data(location_type)
             location_data = next((loc for loc in locations if loc["location_name"] == location_name), None)
             
             if location_data:
@@ -93,7 +96,7 @@ class RentProcessor:
         """Get list of available location types."""
         return ["National", "State", "Metro", "County", "City"]
 
-    def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
+    async def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
         """
         Get list of available locations for a specific type.
         
@@ -103,4 +106,4 @@ class RentProcessor:
         Returns:
             List of location names and their types
         """
-        return self.db.get_locations_by_type(location_type) 
\ No newline at end of file
+        return await self.db.get_locations_by_type(location_type) 
\ No newline at end of file
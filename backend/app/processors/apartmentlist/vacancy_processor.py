@@ -3,6 +3,7 @@ Vacancy data processing module.
 Handles business logic for apartment vacancy data.
 """
 
+import asyncio
 from typing import List, Dict, Any, Tuple
 from ...database.apartmentlist.vacancy_db import VacancyDBClient
 
@@ -13,7 +14,7 @@ class VacancyProcessor:
         """Initialize vacancy data processor."""
         self.db = VacancyDBClient()
         
-    def get_summary_data(self) -> Dict[str, Any]:
+    async def get_summary_data(self) -> Dict[str, Any]:
         """
         Get summary data for all location types.
         Returns top and bottom locations for states, metros, and cities.
@@ -26,10 +27,12 @@ class VacancyProcessor:
                     - Latest 3 months' vacancy rates
                     - Trailing 3-month year-over-year change
         """
-        # Get data for each location type
-        states_data = self.db.get_location_data("State")
-        metros_data = self.db.get_location_data("Metro")
-        cities_data = self.db.get_location_data("City")
+        # Get data for each location type concurrently
+        states_data, metros_data, cities_data = await asyncio.gather(
+            self.db.get_location_data("State"),
+            self.db.get_location_data("Metro"),
+            self.db.get_location_data("City")
+        )
         
         def split_data(data: List[Dict[str, Any]], top_count: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
             """Split data into top and bottom performers."""
@@ -43,9 +46,8 @@ class VacancyProcessor:
             if not valid_data:
                 return [], []
                 
-            # Sort by trailing 3-month YoY change
-            sorted_data = sorted(valid_data, key=lambda x: x["trailing_3m_yoy_change"], reverse=True)
-            return sorted_data[:top_count], sorted_data[-top_count:][::-1]
+            # get_location_data already sorts by trailing 3-month YoY change, descending
+            return valid_data[:top_count], valid_data[-top_count:][::-1]
         
         # Get top/bottom 3 states and top/bottom 10 metros/cities
         top_states, bottom_states = split_data(states_data, 3)
@@ -83,7 +85,7 @@ class VacancyProcessor:
             }
         }
 
-    def get_location_details(self, location_type: str, location_name: str) -> Dict[str, Any]:
+    async def get_location_details(self, location_type: str, location_name: str) -> Dict[str, Any]:
         """
         Get detailed time series data for a specific location.
         
@@ -94,11 +96,11 @@ class VacancyProcessor:
         Returns:
             Dictionary containing time series data and metadata
         """
-        time_series = self.db.get_location_time_series(location_type, location_name)
+        time_series = await self.db.get_location_time_series(location_type, location_name)
         
         if not time_series:
             # Try to get basic data
-            locations = self.db.get_location_data(location_type)
+            locations = await self.db.get_location_data(location_type)
             location_data = next((loc for loc in locations if loc["location_name"] == location_name), None)
             
             if location_data:
@@ -143,7 +145,7 @@ class VacancyProcessor:
         """Get list of available location types."""
         return ["National", "State", "Metro", "County", "City"]
 
-    def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
+    async def get_locations_by_type(self, location_type: str) -> List[Dict[str, str]]:
         """
         Get list of available locations for a specific type.
         
@@ -153,4 +155,4 @@ class VacancyProcessor:
         Returns:
             List of location names and their types
         """
-        return self.db.get_locations_by_type(location_type) 
\ No newline at end of file
+        return await self.db.get_locations_by_type(location_type) 
\ No newline at end of file
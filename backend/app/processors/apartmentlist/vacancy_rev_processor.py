@@ -4,8 +4,11 @@ Handles business logic for apartment vacancy rate data.
 """
 
 import logging
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional
 from ...database.apartmentlist.vacancy_rev_db import VacancyRevDBClient
+from ...core.single_flight import coalesced
+from ...database.data_version import VersionedCache
+from ...database.months import month_label
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,82 +18,134 @@ class VacancyRevProcessor:
     
     def __init__(self):
         """Initialize processor with database client."""
+        self.cache = VersionedCache()
         self.db_client = VacancyRevDBClient()
         
-    def get_summary_data(self, location_type: str) -> Dict[str, Any]:
+    def warm_snapshot(self) -> None:
+        """Start loading the view snapshot in the background so later calls are served from memory."""
+        self.db_client.warm_snapshot()
+        
+    @coalesced
+    async def get_summary_data(
+        self,
+        location_type: str,
+        top_n: Optional[int] = None,
+        offset: int = 0,
+        window: int = 3,
+        lag: int = 12
+    ) -> Dict[str, Any]:
         """
         Get summary data for locations of specified type.
         
         Args:
             location_type: Type of location (State, Metro, City)
+            top_n: Locations in each of the top and bottom groups (defaults to 3 for State, else 10)
+            offset: Number of ranked locations to skip in each group
+            window: Trailing months averaged into ``yoy_change``
+            lag: Months between compared values (12 for YoY, 1 for MoM)
             
         Returns:
             Dictionary containing summary data and metadata
         """
         try:
-            # Get latest months for metadata
-            latest_months = self.db_client.get_latest_months(3)
-            if not latest_months:
-                return {"error": "No data available"}
-                
-            # Get location data
-            locations = self.db_client.get_location_data(location_type)
-            if not locations:
-                return {"error": f"No data available for {location_type}"}
+            version = await self.db_client.get_data_version()
+            top_count = top_n or (3 if location_type == 'State' else 10)
+            cache_key = ("summary", location_type, top_count, offset, window, lag)
+            cached = self.cache.get(version, cache_key)
+            if cached is not None:
+                return cached
+            
+            total_locations = None
+            ranked = None
+            # The Postgres ranking only covers the default trailing 3-month YoY
+            if not self.db_client.has_snapshot() and window == 3 and lag == 12:
+                ranked = await self._get_ranked_data(location_type, top_count, offset)
                 
-            # Split into top and bottom locations
-            top_count = 3 if location_type == 'State' else 10
-            top_locations, bottom_locations = self._split_data(locations, top_count)
+            if ranked:
+                top_locations, bottom_locations, latest_months = ranked
+            else:
+                # Get latest months for metadata
+                latest_months = await self.db_client.get_latest_months(3)
+                if not latest_months:
+                    return {"error": "No data available"}
+                    
+                # Slice top and bottom locations from the precomputed ranking
+                rank_index = await self.db_client.get_rank_index(location_type, window=window, lag=lag)
+                if not len(rank_index):
+                    return {"error": f"No data available for {location_type}"}
+                    
+                top_locations = rank_index.top(top_count, offset)
+                bottom_locations = rank_index.bottom(top_count, offset)
+                total_locations = len(rank_index)
             
-            return {
+            result = {
                 "metadata": {
                     "latest_months": latest_months,
                     "location_type": location_type,
-                    "data_version": "1.0",
-                    "last_updated": latest_months[0] if latest_months else None
+                    "data_version": version,
+                    "last_updated": latest_months[0] if latest_months else None,
+                    "top_n": top_count,
+                    "offset": offset,
+                    "window": window,
+                    "lag": lag,
+                    "total_locations": total_locations
                 },
                 "data": {
                     "top": top_locations,
                     "bottom": bottom_locations
                 }
             }
+            if total_locations is not None:
+                # Cold-start results from Postgres are not cached so the snapshot ranking takes over
+                self.cache.set(version, cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error processing summary data: {str(e)}")
             return {"error": "Failed to process summary data"}
             
-    def _split_data(
+    async def _get_ranked_data(
         self,
-        data: List[Dict[str, Any]],
-        top_count: int
-    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        location_type: str,
+        top_count: int,
+        offset: int = 0
+    ) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str]]]:
         """
-        Split location data into top and bottom groups.
+        Rank locations in Postgres while the in-memory snapshot is still cold.
+        
+        Only the top and bottom rows are transferred; the snapshot starts
+        loading in the background so later requests are served from memory.
         
         Args:
-            data: List of location data
-            top_count: Number of locations to include in each group
+            location_type: Type of location
+            top_count: Number of locations in each group
+            offset: Number of ranked locations to skip in each group
             
         Returns:
-            Tuple of (top_locations, bottom_locations)
+            Tuple of (top_locations, bottom_locations, latest_months), or None
+            when the ranking function is unavailable or returns nothing
         """
-        # Sort by YoY change
-        sorted_data = sorted(
-            data,
-            key=lambda x: x.get('yoy_change', 0),
-            reverse=True
-        )
-        
-        # Get top and bottom locations
-        top = sorted_data[:top_count]
-        bottom = sorted_data[-top_count:][::-1]  # Reverse to show largest negative first
-        
-        return top, bottom
+        self.db_client.warm_snapshot()
+        try:
+            top_locations, bottom_locations, latest_months = await self.db_client.get_ranked_locations(
+                location_type,
+                offset + top_count
+            )
+        except Exception as e:
+            logger.warning(f"Ranking function unavailable, using snapshot: {str(e)}")
+            return None
+        if len(top_locations) <= offset:
+            return None
+        return top_locations[offset:], bottom_locations[offset:], latest_months
         
-    def get_location_details(
+    @coalesced
+    async def get_location_details(
         self,
         location_type: str,
-        location_name: str
+        location_name: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        max_points: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Get detailed data for a specific location.
@@ -98,34 +153,151 @@ class VacancyRevProcessor:
         Args:
             location_type: Type of location
             location_name: Name of location
+            start: First month code to include
+            end: Last month code to include
+            max_points: Maximum number of months, downsampled with LTTB
             
         Returns:
             Dictionary containing location details and time series data
         """
         try:
+            version = await self.db_client.get_data_version()
+            cache_key = ("details", location_type, location_name, start, end, max_points)
+            cached = self.cache.get(version, cache_key)
+            if cached is not None:
+                return cached
+            
             # Get time series data
-            time_series = self.db_client.get_location_time_series(
+            time_series = await self.db_client.get_location_time_series(
                 location_type,
-                location_name
+                location_name,
+                start=start,
+                end=end,
+                max_points=max_points
             )
             
             if not time_series:
                 return {"error": f"No data available for {location_name}"}
                 
-            return {
+            forecast_pending = time_series.pop("forecast_pending", False)
+            
+            result = {
                 "metadata": {
                     "location_type": location_type,
                     "location_name": location_name,
-                    "data_version": "1.0"
+                    "data_version": version,
+                    "start": month_label(start) if start is not None else None,
+                    "end": month_label(end) if end is not None else None,
+                    "max_points": max_points,
+                    "forecast_pending": forecast_pending
                 },
                 "data": time_series
             }
+            if not forecast_pending:
+                # Cached once forecasts are fitted so the cached response includes them
+                self.cache.set(version, cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error processing location details: {str(e)}")
             return {"error": "Failed to process location details"}
             
-    def get_location_types(self) -> Dict[str, Any]:
+    @coalesced
+    async def get_location_rolling_stats(
+        self,
+        location_type: str,
+        location_name: str,
+        windows: List[int]
+    ) -> Dict[str, Any]:
+        """
+        Get rolling statistics for a specific location.
+        
+        Args:
+            location_type: Type of location
+            location_name: Name of location
+            windows: Rolling window lengths in months
+            
+        Returns:
+            Dictionary containing rolling mean, rolling std and drawdown data
+        """
+        try:
+            windows = sorted(set(windows))
+            cache_key = ("rolling", location_type, location_name, tuple(windows))
+            version = await self.db_client.get_data_version()
+            cached = self.cache.get(version, cache_key)
+            if cached is not None:
+                return cached
+            
+            stats = await self.db_client.get_location_rolling_stats(location_type, location_name, windows)
+            if not stats:
+                return {"error": f"No data available for {location_name}"}
+                
+            result = {
+                "metadata": {
+                    "location_type": location_type,
+                    "location_name": location_name,
+                    "data_version": version,
+                    "windows": windows
+                },
+                "data": stats
+            }
+            self.cache.set(version, cache_key, result)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error processing rolling statistics: {str(e)}")
+            return {"error": "Failed to process rolling statistics"}
+            
+    @coalesced
+    async def get_location_rank(
+        self,
+        location_type: str,
+        location_name: str,
+        window: int = 3,
+        lag: int = 12
+    ) -> Dict[str, Any]:
+        """
+        Get the trailing YoY rank of a location among all locations of its type.
+        
+        Args:
+            location_type: Type of location
+            location_name: Name of location
+            window: Trailing months averaged into ``yoy_change``
+            lag: Months between compared values (12 for YoY, 1 for MoM)
+            
+        Returns:
+            Dictionary containing rank, total, percentile and summary row
+        """
+        try:
+            version = await self.db_client.get_data_version()
+            cached = self.cache.get(version, ("rank", location_type, location_name, window, lag))
+            if cached is not None:
+                return cached
+            
+            rank_index = await self.db_client.get_rank_index(location_type, window=window, lag=lag)
+            rank = rank_index.rank(location_name)
+            if rank is None:
+                return {"error": f"No ranking available for {location_name}"}
+                
+            result = {
+                "metadata": {
+                    "location_type": location_type,
+                    "location_name": location_name,
+                    "data_version": version,
+                    "window": window,
+                    "lag": lag
+                },
+                "data": rank
+            }
+            self.cache.set(version, ("rank", location_type, location_name, window, lag), result)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error processing location rank: {str(e)}")
+            return {"error": "Failed to get location rank"}
+            
+    @coalesced
+    async def get_location_types(self) -> Dict[str, Any]:
         """
         Get all available location types.
         
@@ -133,19 +305,27 @@ class VacancyRevProcessor:
             Dictionary containing list of location types
         """
         try:
-            types = self.db_client.get_location_types()
-            return {
+            version = await self.db_client.get_data_version()
+            cached = self.cache.get(version, ("types",))
+            if cached is not None:
+                return cached
+            
+            types = await self.db_client.get_location_types()
+            result = {
                 "metadata": {
-                    "data_version": "1.0"
+                    "data_version": version
                 },
                 "data": types
             }
+            self.cache.set(version, ("types",), result)
+            return result
             
         except Exception as e:
             logger.error(f"Error processing location types: {str(e)}")
             return {"error": "Failed to get location types"}
             
-    def get_locations_by_type(self, location_type: str) -> Dict[str, Any]:
+    @coalesced
+    async def get_locations_by_type(self, location_type: str) -> Dict[str, Any]:
         """
         Get available locations for a specific type.
         
@@ -156,14 +336,21 @@ class VacancyRevProcessor:
             Dictionary containing list of locations
         """
         try:
-            locations = self.db_client.get_locations_by_type(location_type)
-            return {
+            version = await self.db_client.get_data_version()
+            cached = self.cache.get(version, ("locations", location_type))
+            if cached is not None:
+                return cached
+            
+            locations = await self.db_client.get_locations_by_type(location_type)
+            result = {
                 "metadata": {
                     "location_type": location_type,
-                    "data_version": "1.0"
+                    "data_version": version
                 },
                 "data": locations
             }
+            self.cache.set(version, ("locations", location_type), result)
+            return result
             
         except Exception as e:
             logger.error(f"Error processing locations: {str(e)}")
@@ -8,6 +8,7 @@ import httpx
 from typing import Dict, Any
 from urllib.parse import urlencode
 from ...core.config import settings
+from .http_client import RENTCAST_BASE_URL, rentcast_http
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -17,7 +18,7 @@ class RentCastAPIClient:
     
     def __init__(self):
         """Initialize the API client."""
-        self.base_url = "https://api.rentcast.io/v1"
+        self.base_url = RENTCAST_BASE_URL
         self.api_key = settings.RENTCAST_API_KEY
         self.headers = {
             "accept": "application/json",
@@ -39,17 +40,16 @@ class RentCastAPIClient:
             query_string = urlencode(params)
             url = f"{self.base_url}/avm/rent/long-term?{query_string}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self.headers,
-                    timeout=30.0
-                )
-                
-                # Check for errors
-                response.raise_for_status()
-                
-                return response.json()
+            # Shared pooled client: connections stay alive between requests
+            response = await rentcast_http.get_client().get(
+                url,
+                headers=self.headers
+            )
+            
+            # Check for errors
+            response.raise_for_status()
+            
+            return response.json()
                 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred: {str(e)}")
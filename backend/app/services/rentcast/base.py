@@ -8,6 +8,7 @@ import httpx
 from typing import Dict, Any
 from urllib.parse import urlencode
 from ...core.config import settings
+from .http_client import RENTCAST_BASE_URL, rentcast_http
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -22,7 +23,7 @@ class BaseRentCastClient:
         Args:
             api_path: API path segment (e.g., 'avm/rent')
         """
-        self.base_url = f"https://api.rentcast.io/v1/{api_path}"
+        self.base_url = f"{RENTCAST_BASE_URL}/{api_path}"
         self.api_key = settings.RENTCAST_API_KEY
         self.headers = {
             "accept": "application/json",
@@ -51,18 +52,17 @@ class BaseRentCastClient:
             query_string = urlencode(params)
             url = f"{self.base_url}/{endpoint}?{query_string}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.request(
-                    method,
-                    url,
-                    headers=self.headers,
-                    timeout=30.0
-                )
-                
-                # Check for errors
-                response.raise_for_status()
-                
-                return response.json()
+            # Shared pooled client: connections stay alive between requests
+            response = await rentcast_http.get_client().request(
+                method,
+                url,
+                headers=self.headers
+            )
+            
+            # Check for errors
+            response.raise_for_status()
+            
+            return response.json()
                 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred: {str(e)}")
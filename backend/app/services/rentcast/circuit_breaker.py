@@ -0,0 +1,165 @@
+"""
+Circuit breaker module.
+Guards calls to a flaky dependency with half-open probing and exponential backoff.
+"""
+
+import time
+import logging
+from typing import Dict, Any, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Three-state circuit breaker.
+
+    ``closed``: calls flow; ``failure_threshold`` consecutive failures open
+    the circuit. ``open``: calls are rejected until the backoff elapses.
+    ``half_open``: a single probe call is let through; success closes the
+    circuit, failure reopens it with the backoff doubled (up to
+    ``max_backoff``).
+
+    ``allow`` hands out a token for each admitted call, and results are
+    reported with it. Every state change (and every probe admission) starts
+    a new generation, so results of calls admitted earlier, such as a slow
+    call that finishes after the circuit opened, are counted but change
+    nothing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        probe_timeout: float = 30.0
+    ):
+        """
+        Initialize breaker in the closed state.
+
+        Args:
+            name: Name used in logs
+            failure_threshold: Consecutive failures that open the circuit
+            base_backoff: Seconds the circuit stays open after first opening
+            max_backoff: Upper bound on the open period
+            probe_timeout: Seconds after which an unfinished probe no longer blocks a new one
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.probe_timeout = probe_timeout
+
+        self.state = CLOSED
+        self.generation = 0
+        self.consecutive_failures = 0
+        self.backoff = base_backoff
+        self._open_until = 0.0
+        self._probe_started: Optional[float] = None
+
+        self.successes = 0
+        self.failures = 0
+        self.stale_results = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def allow(self) -> Optional[int]:
+        """
+        Check whether a call may proceed, moving from open to half-open once the backoff elapses.
+
+        Returns:
+            Token to report the call's result with, or None if the call is
+            rejected (in half-open state the admitted call is the probe)
+        """
+        now = time.monotonic()
+        if self.state == OPEN and now >= self._open_until:
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probe_started is None or now - self._probe_started >= self.probe_timeout:
+                # A new probe supersedes one that timed out
+                self.generation += 1
+                self._probe_started = now
+                return self.generation
+            self.rejected += 1
+            return None
+        if self.state == OPEN:
+            self.rejected += 1
+            return None
+        return self.generation
+
+    def record_success(self, token: int) -> None:
+        """
+        Record a successful call; the current probe's success closes the circuit.
+
+        Args:
+            token: Token returned by ``allow`` for the call
+        """
+        self.successes += 1
+        if token != self.generation:
+            self.stale_results += 1
+            return
+        self.consecutive_failures = 0
+        if self.state == HALF_OPEN:
+            self.backoff = self.base_backoff
+            self._transition(CLOSED)
+
+    def record_failure(self, token: int) -> None:
+        """
+        Record a failed call; opens the circuit at the threshold or after a failed probe.
+
+        Args:
+            token: Token returned by ``allow`` for the call
+        """
+        self.failures += 1
+        if token != self.generation:
+            self.stale_results += 1
+            return
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN:
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+            self._open()
+        elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self.backoff = self.base_backoff
+            self._open()
+
+    def _open(self) -> None:
+        """Open the circuit for the current backoff."""
+        self._open_until = time.monotonic() + self.backoff
+        self.opened += 1
+        self._transition(OPEN)
+        logger.warning(f"Circuit {self.name} open, retrying in {self.backoff:.1f}s")
+
+    def _transition(self, state: str) -> None:
+        """Move to a new state."""
+        if state != self.state:
+            logger.info(f"Circuit {self.name}: {self.state} -> {state}")
+        self.state = state
+        self.generation += 1
+        self._probe_started = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get breaker metrics.
+
+        Returns:
+            Dictionary with state, consecutive failures, current backoff,
+            seconds until the next probe, and call counters (stale results
+            are those of calls admitted before the last state change)
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "backoff_seconds": self.backoff,
+            "retry_in_seconds": max(self._open_until - time.monotonic(), 0.0) if self.state == OPEN else 0.0,
+            "successes": self.successes,
+            "failures": self.failures,
+            "stale_results": self.stale_results,
+            "rejected": self.rejected,
+            "times_opened": self.opened
+        }
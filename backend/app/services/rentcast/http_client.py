@@ -0,0 +1,77 @@
+"""
+RentCast HTTP client module.
+Provides the pooled, long-lived HTTP client shared by every RentCast API client.
+"""
+
+import os
+import logging
+import importlib.util
+from typing import Optional
+import httpx
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+RENTCAST_BASE_URL = "https://api.rentcast.io/v1"
+
+
+class RentCastHTTPClient:
+    """
+    Holder of the shared RentCast ``httpx.AsyncClient``.
+
+    The client is opened on application startup (or on first use) and closed
+    on shutdown, so connections to api.rentcast.io are kept alive across
+    requests instead of paying a TCP+TLS handshake per cache miss.
+    """
+
+    def __init__(self):
+        """Initialize without an open client."""
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared client, opening it on first use.
+
+        Returns:
+            Pooled HTTP client
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and release its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create the client using the connection settings from the environment."""
+        max_connections = int(os.getenv("RENTCAST_POOL_SIZE", "10"))
+        max_keepalive = int(os.getenv("RENTCAST_POOL_KEEPALIVE", "5"))
+        keepalive_expiry = float(os.getenv("RENTCAST_KEEPALIVE_EXPIRY", "120"))
+        timeout = float(os.getenv("RENTCAST_TIMEOUT", "30"))
+        connect_timeout = float(os.getenv("RENTCAST_CONNECT_TIMEOUT", "5"))
+        http2 = os.getenv("RENTCAST_HTTP2", "True").lower() == "true"
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed. Using HTTP/1.1.")
+            http2 = False
+
+        logger.info(
+            f"Creating pooled RentCast client: pool={max_connections}, "
+            f"keepalive={max_keepalive}/{keepalive_expiry}s, http2={http2}"
+        )
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            http2=http2
+        )
+
+
+# Process-wide RentCast HTTP client shared by all RentCast API clients
+rentcast_http = RentCastHTTPClient()
@@ -0,0 +1,119 @@
+"""
+In-process cache module.
+Byte-bounded LRU cache with per-entry TTL, used in front of Redis.
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class MemoryLRUCache:
+    """
+    Least-recently-used cache bounded by the total size of its entries.
+
+    Each entry carries its own expiry time and the byte size of its
+    serialized form; the least recently used entries are evicted until the
+    total fits ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: Upper bound on the summed size of all entries
+            ttl: Default time to live in seconds
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Number of cached entries (expired ones included until touched)."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a live entry and mark it as most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None) -> bool:
+        """
+        Cache a value, evicting least recently used entries to stay within budget.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            size: Size of the value in bytes (e.g. of its serialized form)
+            ttl: Time to live in seconds (defaults to the cache TTL)
+
+        Returns:
+            True if cached, False if the value alone exceeds the budget or has expired
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if size > self.max_bytes or ttl <= 0:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+
+    def delete(self, key: str) -> None:
+        """Drop an entry if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and release its bytes."""
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with entries, bytes, budget, hits, misses, hit ratio and evictions
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions
+        }
@@ -1,15 +1,22 @@
 """
 Cache manager for RentCast rent estimates.
-Implements caching using Redis with graceful fallback.
+Implements two-tier caching: an in-process LRU in front of Redis, with a circuit breaker around Redis
+and stale-while-revalidate serving between the soft and hard expirations.
 """
 
+import os
+import time
+import asyncio
 import logging
 import json
 import hashlib
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable
 from redis import asyncio as aioredis
 from redis.exceptions import ConnectionError
 from ....core.config import settings
+from ..memory_cache import MemoryLRUCache
+from ..circuit_breaker import CircuitBreaker, HALF_OPEN
+from ....core.single_flight import single_flight
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -20,25 +27,84 @@ class RentEstimatesCacheManager:
     def __init__(self):
         """Initialize the cache manager."""
         self.redis = None
-        self.ttl = 1800  # 30 minutes in seconds
+        self.ttl = 1800  # 30 minutes in seconds: soft expiration, entries are fresh until then
+        # Hard expiration: stale entries are still served (while refreshed in
+        # the background) until they are this old
+        self.stale_ttl = self.ttl + int(os.getenv("RENTCAST_CACHE_STALE_SECONDS", str(6 * 3600)))
+        # In-process tier: serves hot addresses without a network hop, and is
+        # the only tier when Redis is not configured
+        self.memory = MemoryLRUCache(
+            max_bytes=int(os.getenv("RENTCAST_MEMORY_CACHE_BYTES", str(32 * 1024 * 1024))),
+            ttl=self.stale_ttl
+        )
+        # Background refreshes in flight, one per cache key
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        # Redis failures open the circuit instead of disabling Redis for the
+        # life of the process; the in-process tier keeps serving meanwhile
+        self.breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=int(os.getenv("REDIS_BREAKER_FAILURES", "3")),
+            base_backoff=float(os.getenv("REDIS_BREAKER_BACKOFF", "1")),
+            max_backoff=float(os.getenv("REDIS_BREAKER_MAX_BACKOFF", "300"))
+        )
         self._init_redis()
         
     def _init_redis(self) -> None:
         """Initialize Redis connection with error handling."""
         if not settings.REDIS_URL:
-            logger.info("Redis URL not configured. Cache will be disabled.")
+            logger.info("Redis URL not configured. Using in-process cache only.")
             return
 
         try:
+            timeout = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
             self.redis = aioredis.from_url(
                 settings.REDIS_URL,
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=True,
+                socket_timeout=timeout,
+                socket_connect_timeout=timeout
             )
             logger.info("Successfully connected to Redis")
         except Exception as e:
-            logger.warning(f"Failed to connect to Redis: {str(e)}. Cache will be disabled.")
+            logger.warning(f"Failed to connect to Redis: {str(e)}. Using in-process cache only.")
             self.redis = None
+
+    async def _reconnect(self) -> None:
+        """Replace the Redis client, dropping connections of the previous one."""
+        old = self.redis
+        self._init_redis()
+        if old is not None:
+            try:
+                await old.connection_pool.disconnect()
+            except Exception as e:
+                logger.debug(f"Error closing previous Redis connections: {str(e)}")
+
+    async def _admit_redis(self) -> Optional[int]:
+        """
+        Check whether Redis may be used for this call.
+
+        The half-open probe (or a call after a failed client creation)
+        reconnects first, so recovery does not rely on stale connections.
+
+        Returns:
+            Circuit breaker token to report the call's result with, or None
+            if Redis is not configured or the circuit rejects the call
+        """
+        if not settings.REDIS_URL:
+            return None
+        token = self.breaker.allow()
+        if token is None:
+            return None
+        if self.redis is None or self.breaker.state == HALF_OPEN:
+            await self._reconnect()
+            if self.redis is None:
+                self.breaker.record_failure(token)
+                return None
+        return token
         
     def _generate_cache_key(self, params: Dict[str, Any]) -> str:
         """
@@ -57,33 +123,157 @@ class RentEstimatesCacheManager:
         # Create key with prefix
         return f"rentcast:rent_estimates:{params_hash}"
         
-    async def get(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _is_fresh(self, cached_data: Dict[str, Any]) -> bool:
+        """Check whether a cache entry is younger than the soft expiration."""
+        return time.time() - cached_data.get('cached_at', 0) < self.ttl
+
+    async def get_or_fetch(
+        self,
+        params: Dict[str, Any],
+        fetch: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
         """
-        Get cached data for parameters.
+        Get data for parameters, serving stale entries while they are refreshed.
+
+        The in-process tier is checked first, then Redis on a miss or when
+        the in-process copy is stale (another worker may have refreshed it
+        already). Fresh entries are returned as is. Entries past the soft
+        expiration but within the hard one are returned immediately and
+        refreshed by a background task (at most one per key). On a miss,
+        concurrent callers of the same parameters share one fetch.
+
+        Args:
+            params: Dictionary of request parameters
+            fetch: Coroutine function fetching the data from upstream
+
+        Returns:
+            Cached or freshly fetched data
+        """
+        key = self._generate_cache_key(params)
+        cached_data = self._get_from_memory(key, params)
+        if cached_data is None:
+            cached_data = await self._get_from_redis(key, params)
+        elif not self._is_fresh(cached_data) and key not in self._refreshing:
+            newer = await self._get_from_redis(key, params, newer_than=cached_data.get('cached_at', 0))
+            if newer is not None:
+                cached_data = newer
+        if cached_data is not None:
+            if self._is_fresh(cached_data):
+                self.fresh_hits += 1
+            else:
+                self.stale_hits += 1
+                logger.info(f"Serving stale data for key: {key}")
+                self._schedule_refresh(key, params, fetch)
+            return cached_data.get('response')
+
+        return await single_flight.do(
+            "RentEstimatesCacheManager.fetch",
+            key,
+            lambda: self._fetch_and_set(params, fetch)
+        )
+
+    async def _fetch_and_set(
+        self,
+        params: Dict[str, Any],
+        fetch: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Fetch data from upstream and cache it."""
+        response = await fetch(params)
+        await self.set(params, response)
+        return response
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        params: Dict[str, Any],
+        fetch: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    ) -> None:
+        """Start a background refresh of a key unless one is already running."""
+        if key in self._refreshing:
+            return
+        self.refreshes += 1
+        task = asyncio.ensure_future(
+            single_flight.do("RentEstimatesCacheManager.fetch", key, lambda: self._fetch_and_set(params, fetch))
+        )
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done: self._finish_refresh(key, done))
+
+    def _finish_refresh(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished background refresh, logging its failure."""
+        self._refreshing.pop(key, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            # The stale entry stays in place until its hard expiration
+            self.refresh_failures += 1
+            logger.warning(f"Background refresh failed for key {key}: {str(error)}")
+
+    def _get_from_memory(self, key: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Get the cache entry for parameters from the in-process tier.
         
         Args:
+            key: Cache key
             params: Dictionary of request parameters
             
         Returns:
-            Cached data if exists and valid, None otherwise
+            Cache entry (params, response and cached_at) if exists and not past
+            the hard expiration, None otherwise
         """
-        if not self.redis:
+        cached_data = self.memory.get(key)
+        if cached_data is not None and cached_data.get('params') == params:
+            logger.info(f"Memory cache hit for key: {key}")
+            return cached_data
+        return None
+
+    async def _get_from_redis(
+        self,
+        key: str,
+        params: Dict[str, Any],
+        newer_than: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the cache entry for parameters from Redis and promote it to the in-process tier.
+        
+        Args:
+            key: Cache key
+            params: Dictionary of request parameters
+            newer_than: Only return (and promote) an entry cached after this
+                UNIX time; None accepts any entry, including ones written
+                without ``cached_at`` (those are served as stale)
+            
+        Returns:
+            Cache entry (params, response and cached_at) if exists, newer than
+            ``newer_than`` (when given) and not past the hard expiration,
+            None otherwise
+        """
+        token = await self._admit_redis()
+        if token is None:
             return None
             
         try:
-            key = self._generate_cache_key(params)
-            data = await self.redis.get(key)
+            # Fetch value and remaining TTL in one round trip
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.ttl(key)
+                data, ttl = await pipe.execute()
+            self.breaker.record_success(token)
             if data:
                 cached_data = json.loads(data)
                 # Verify parameters match
-                if cached_data.get('params') == params:
+                if cached_data.get('params') != params:
+                    return None
+                if newer_than is None or cached_data.get('cached_at', 0) > newer_than:
                     logger.info(f"Cache hit for key: {key}")
-                    return cached_data.get('response')
+                    # Promote to the in-process tier for the rest of the Redis TTL
+                    if ttl and ttl > 0:
+                        self.memory.set(key, cached_data, len(data), ttl)
+                    return cached_data
             return None
         except Exception as e:
             logger.error(f"Error getting cached data: {str(e)}")
-            # Disable Redis on error
-            self.redis = None
+            self.breaker.record_failure(token)
             return None
             
     async def set(self, params: Dict[str, Any], response: Dict[str, Any]) -> bool:
@@ -97,24 +287,49 @@ class RentEstimatesCacheManager:
         Returns:
             True if successful, False otherwise
         """
-        if not self.redis:
-            return False
+        key = self._generate_cache_key(params)
+        cache_data = {
+            'params': params,
+            'response': response,
+            'cached_at': time.time()
+        }
+        serialized = json.dumps(cache_data)
+        cached_in_memory = self.memory.set(key, cache_data, len(serialized))
+        
+        token = await self._admit_redis()
+        if token is None:
+            return cached_in_memory
             
         try:
-            key = self._generate_cache_key(params)
-            cache_data = {
-                'params': params,
-                'response': response
-            }
             await self.redis.setex(
                 key,
-                self.ttl,
-                json.dumps(cache_data)
+                self.stale_ttl,
+                serialized
             )
+            self.breaker.record_success(token)
             logger.info(f"Cached data for key: {key}")
             return True
         except Exception as e:
             logger.error(f"Error setting cached data: {str(e)}")
-            # Disable Redis on error
-            self.redis = None
-            return False 
\ No newline at end of file
+            self.breaker.record_failure(token)
+            return cached_in_memory
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+        
+        Returns:
+            Dictionary with fresh/stale hit and background refresh counters,
+            in-process tier metrics, whether Redis is configured, and the
+            Redis circuit breaker state
+        """
+        return {
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "refreshes_in_flight": len(self._refreshing),
+            "refresh_failures": self.refresh_failures,
+            "memory": self.memory.stats(),
+            "redis_enabled": bool(settings.REDIS_URL),
+            "redis_circuit": self.breaker.stats()
+        }
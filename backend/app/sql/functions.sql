@@ -30,4 +30,79 @@ BEGIN
         table_name
     ) USING loc_type;
 END;
-$$ LANGUAGE plpgsql; 
\ No newline at end of file
+$$ LANGUAGE plpgsql;
+
+-- 获取 trailing N 个月同比变化排名前/后 K 的地区
+-- 每个地区把最近 N 个月分别与一年前同月比较，剔除无效月份（缺失或基数 <= 0）后取平均
+CREATE OR REPLACE FUNCTION get_ranked_yoy_locations(
+    table_name text,
+    metric_column text,
+    loc_type text,
+    month_count integer,
+    top_k integer
+)
+RETURNS TABLE (
+    rank_group text,
+    location_rank integer,
+    location_name text,
+    latest_months text[],
+    year_months text[],
+    month_values double precision[],
+    yoy_change double precision
+) AS $$
+BEGIN
+    RETURN QUERY EXECUTE format(
+        'WITH latest AS (
+             SELECT DISTINCT year_month
+             FROM %1$I
+             ORDER BY year_month DESC
+             LIMIT $2
+         ),
+         paired AS (
+             SELECT c.location_name,
+                    c.year_month,
+                    c.%2$I::double precision AS value,
+                    p.%2$I::double precision AS year_ago_value
+             FROM %1$I c
+             JOIN latest l ON l.year_month = c.year_month
+             LEFT JOIN %1$I p
+               ON p.location_type = c.location_type
+              AND p.location_name = c.location_name
+              AND p.year_month = to_char(to_date(c.year_month, ''YYYY_MM'') - interval ''1 year'', ''YYYY_MM'')
+             WHERE c.location_type = $1
+         ),
+         scored AS (
+             SELECT location_name,
+                    array_agg(year_month ORDER BY year_month DESC) AS year_months,
+                    array_agg(value ORDER BY year_month DESC) AS month_values,
+                    avg((value - year_ago_value) / year_ago_value * 100)
+                        FILTER (WHERE value IS NOT NULL AND year_ago_value > 0) AS yoy_change
+             FROM paired
+             GROUP BY location_name
+         ),
+         ranked AS (
+             SELECT s.*,
+                    row_number() OVER (ORDER BY s.yoy_change DESC, s.location_name) AS top_rank,
+                    row_number() OVER (ORDER BY s.yoy_change ASC, s.location_name) AS bottom_rank
+             FROM scored s
+             WHERE s.yoy_change IS NOT NULL
+         ),
+         months AS (
+             SELECT array_agg(year_month ORDER BY year_month DESC) AS latest_months
+             FROM latest
+         )
+         SELECT ''top''::text, top_rank::integer, location_name, m.latest_months,
+                year_months, month_values, yoy_change
+         FROM ranked, months m
+         WHERE top_rank <= $3
+         UNION ALL
+         SELECT ''bottom''::text, bottom_rank::integer, location_name, m.latest_months,
+                year_months, month_values, yoy_change
+         FROM ranked, months m
+         WHERE bottom_rank <= $3
+         ORDER BY 1 DESC, 2',
+        table_name,
+        metric_column
+    ) USING loc_type, month_count, top_k;
+END;
+$$ LANGUAGE plpgsql STABLE;
@@ -0,0 +1,151 @@
+"""
+Response serialization and compression benchmark.
+
+Fetches real detail payloads through the rent, vacancy and time-on-market
+processors and compares, per payload:
+
+- stdlib: FastAPI's default path (``jsonable_encoder`` + ``json.dumps``)
+- orjson: ``ORJSONResponse`` rendering returned directly from the routes
+- gzip / brotli: transfer size and compression time of the orjson body
+
+Usage (from the backend directory, with Supabase credentials in .env):
+
+    python scripts/benchmark_responses.py --locations 20 --repeat 50
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import asyncio
+import argparse
+from typing import List, Dict, Any, Callable
+from dotenv import load_dotenv
+
+# Add backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load environment variables
+load_dotenv()
+
+from fastapi.encoders import jsonable_encoder
+from app.core.responses import dumps
+from app.processors.apartmentlist.rent_rev_processor import RentRevProcessor
+from app.processors.apartmentlist.vacancy_rev_processor import VacancyRevProcessor
+from app.processors.apartmentlist.time_on_market_processor import TimeOnMarketProcessor
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+
+async def collect_payloads(processors: List[Any], per_type: int) -> List[Dict[str, Any]]:
+    """
+    Fetch detail payloads for the first locations of every type.
+
+    Args:
+        processors: Processors exposing get_location_types/get_locations_by_type/get_location_details
+        per_type: Number of locations per location type
+
+    Returns:
+        List of detail responses as returned by the routes
+    """
+    payloads = []
+    for processor in processors:
+        types = await processor.get_location_types()
+        for location_type in types.get("data", []):
+            locations = await processor.get_locations_by_type(location_type)
+            for location in locations.get("data", [])[:per_type]:
+                details = await processor.get_location_details(location_type, location["location_name"])
+                if "error" not in details:
+                    payloads.append(details)
+    return payloads
+
+
+def time_per_call(func: Callable[[], Any], repeat: int) -> float:
+    """Average wall time of ``func`` in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def benchmark(payloads: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    """
+    Measure serialization time and transfer size over all payloads.
+
+    Args:
+        payloads: Detail responses
+        repeat: Timing repetitions per payload
+
+    Returns:
+        Totals per metric (milliseconds per full pass, bytes)
+    """
+    totals = {
+        "stdlib_ms": 0.0, "orjson_ms": 0.0, "gzip_ms": 0.0, "brotli_ms": 0.0,
+        "stdlib_bytes": 0, "orjson_bytes": 0, "gzip_bytes": 0, "brotli_bytes": 0
+    }
+    for payload in payloads:
+        stdlib_body = json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, allow_nan=False,
+            indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        body = dumps(payload)
+        totals["stdlib_ms"] += time_per_call(
+            lambda: json.dumps(
+                jsonable_encoder(payload), ensure_ascii=False, allow_nan=False,
+                indent=None, separators=(",", ":")
+            ).encode("utf-8"),
+            repeat
+        )
+        totals["orjson_ms"] += time_per_call(lambda: dumps(payload), repeat)
+        totals["gzip_ms"] += time_per_call(lambda: gzip.compress(body, compresslevel=6, mtime=0), repeat)
+        totals["stdlib_bytes"] += len(stdlib_body)
+        totals["orjson_bytes"] += len(body)
+        totals["gzip_bytes"] += len(gzip.compress(body, compresslevel=6, mtime=0))
+        if brotli is not None:
+            totals["brotli_ms"] += time_per_call(lambda: brotli.compress(body, quality=5), repeat)
+            totals["brotli_bytes"] += len(brotli.compress(body, quality=5))
+    return totals
+
+
+def report(payloads: List[Dict[str, Any]], totals: Dict[str, float]) -> None:
+    """Print the benchmark results."""
+    count = len(payloads)
+    print(f"Detail payloads: {count}")
+    print(f"{'':<10}{'ms/payload':>12}{'KB/payload':>12}{'vs stdlib':>12}")
+
+    def row(label: str, ms: float, size: float) -> None:
+        print(
+            f"{label:<10}{ms / count:>12.3f}{size / count / 1024:>12.1f}"
+            f"{totals['stdlib_bytes'] / size if size else 0:>11.1f}x"
+        )
+
+    row("stdlib", totals["stdlib_ms"], totals["stdlib_bytes"])
+    row("orjson", totals["orjson_ms"], totals["orjson_bytes"])
+    row("gzip", totals["orjson_ms"] + totals["gzip_ms"], totals["gzip_bytes"])
+    if brotli is not None:
+        row("brotli", totals["orjson_ms"] + totals["brotli_ms"], totals["brotli_bytes"])
+    else:
+        print("brotli    (not installed)")
+    print(f"Serialization speedup: {totals['stdlib_ms'] / totals['orjson_ms']:.1f}x")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locations", type=int, default=10, help="locations per location type")
+    parser.add_argument("--repeat", type=int, default=20, help="timing repetitions per payload")
+    args = parser.parse_args()
+
+    processors = [RentRevProcessor(), VacancyRevProcessor(), TimeOnMarketProcessor()]
+    payloads = await collect_payloads(processors, args.locations)
+    if not payloads:
+        print("No detail payloads found")
+        return
+    report(payloads, benchmark(payloads, args.repeat))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,13 +9,16 @@ setup(
         "uvicorn==0.27.1",
         "supabase==1.2.0",
         "pandas==2.2.0",
+        "numpy>=1.26.0,<2.0.0",
         "python-dotenv==1.0.1",
         "pydantic==2.6.1",
         "sqlalchemy==2.0.25",
         "python-multipart==0.0.6",
         "pytest==8.0.0",
         "httpx>=0.24,<0.26",
+        "h2>=4.1.0,<5.0.0",
         "gotrue==1.1.0",
-        "postgrest>=0.10.8,<0.12.0"
+        "postgrest>=0.10.8,<0.12.0",
+        "orjson>=3.8.0,<4.0.0"
     ],
 ) 
\ No newline at end of file
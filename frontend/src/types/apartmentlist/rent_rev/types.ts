@@ -57,6 +57,12 @@ export interface SummaryData {
     };
 }
 
+export interface ForecastSeries {
+    values: number[];
+    lower: number[];
+    upper: number[];
+}
+
 export interface TimeSeriesData {
     dates: string[];
     rent_estimate: {
@@ -71,6 +77,14 @@ export interface TimeSeriesData {
         values: number[];
         yoy_changes: number[];
     };
+    forecast?: {
+        method: string;
+        interval: number;
+        dates: string[];
+        rent_estimate?: ForecastSeries;
+        rent_estimate_1br?: ForecastSeries;
+        rent_estimate_2br?: ForecastSeries;
+    };
 }
 
 export interface LocationDetail {
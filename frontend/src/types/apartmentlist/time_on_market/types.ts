@@ -10,12 +10,24 @@ export interface LocationData {
     yoy_change?: number;
 }
 
+export interface ForecastSeries {
+    values: number[];
+    lower: number[];
+    upper: number[];
+}
+
 export interface TimeSeriesData {
     dates: string[];
     time_on_market: {
         values: (number | null)[];
         yoy_changes: (number | null)[];
     };
+    forecast?: {
+        method: string;
+        interval: number;
+        dates: string[];
+        time_on_market?: ForecastSeries;
+    };
 }
 
 export interface LocationDetail {
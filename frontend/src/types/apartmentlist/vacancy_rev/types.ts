@@ -44,12 +44,24 @@ export interface SummaryData {
     };
 }
 
+export interface ForecastSeries {
+    values: number[];
+    lower: number[];
+    upper: number[];
+}
+
 export interface TimeSeriesData {
     dates: string[];
     vacancy_index: {
         values: number[];
         yoy_changes: number[];
     };
+    forecast?: {
+        method: string;
+        interval: number;
+        dates: string[];
+        vacancy_index?: ForecastSeries;
+    };
 }
 
 export interface LocationDetail {